@@ -6,10 +6,12 @@ import re
 import datetime
 import time
 import random
+import functools
 from urllib.parse import urlparse
+from earnings_analyzer.utils.cache import response_cache
+from earnings_analyzer.utils.http import create_session
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
 
 # User agent rotation for web scraping
 USER_AGENTS = [
@@ -20,6 +22,46 @@ USER_AGENTS = [
     'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
 ]
 
+# Shared session so repeated transcript scrapes reuse pooled connections
+_session = create_session()
+
+_TICKER_RE = re.compile(r'^[A-Z0-9]{1,5}$')
+
+# Transcript URL formats, tried in order by get_transcript_metadata_from_url().
+# Wildcards stay within one path segment so no pattern can backtrack across the whole URL.
+_TRANSCRIPT_URL_PATTERNS = (
+    # Pattern: /earnings/call-transcripts/YYYY/MM/DD/company-ticker-q#-YYYY-earnings-call-transcript/
+    re.compile(r'/earnings/call-transcripts/(\d{4})/(\d{2})/(\d{2})/[^/]*?-([a-zA-Z]+)-q(\d)-(\d{4})-earnings-call-transcript', re.IGNORECASE),
+    # Alternative pattern: /transcripts/YYYY/MM/DD/ticker-q#-YYYY/
+    re.compile(r'/transcripts/(\d{4})/(\d{2})/(\d{2})/([a-zA-Z]+)-q(\d)-(\d{4})', re.IGNORECASE),
+    # More flexible pattern: the word just before "q#" in the slug, then the first 4-digit year after it
+    re.compile(r'(\d{4})/(\d{2})/(\d{2})/[^/]*?\b([a-zA-Z]{2,5})\W?q(\d)\D*?(\d{4})', re.IGNORECASE),
+)
+
+# Short lines that carry transcript structure and must survive the short-line filter:
+# section headers, the bare "Operator" label and "Name -- Title" speaker headers
+_SECTION_HEADER_RE = re.compile(
+    r'^(?:operator|prepared remarks|questions?\s*(?:&|and)\s*answers?|call participants)\s*:?$',
+    re.IGNORECASE
+)
+_SPEAKER_HEADER_RE = re.compile(r'^[A-Z][\w.\'\- ]{1,60} -- \S')
+
+# Block elements that hold one transcript paragraph or header each
+_TEXT_BLOCK_TAGS = ['p', 'h2', 'h3', 'h4']
+
+# Substrings that mark a fool.com URL as a transcript page
+_TRANSCRIPT_URL_MARKERS = ('earnings-call-transcript', 'earnings/call-transcripts', '/transcripts/')
+
+@functools.lru_cache(maxsize=128)
+def _quarter_url_patterns(ticker, quarter, year):
+    """Compiled slug patterns matching a specific ticker, quarter and year."""
+    ticker, quarter = re.escape(ticker.lower()), quarter.lower()
+    return (
+        re.compile(rf'-{ticker}-{quarter}-{year}-earnings'),
+        re.compile(rf'{quarter}-{year}[^/]*{ticker}[^/]*earnings'),
+        re.compile(rf'{ticker}[^/]*{quarter}[^/]*{year}[^/]*earnings'),
+    )
+
 def _get_random_headers():
     """Get randomized headers for web scraping."""
     return {
@@ -39,8 +81,8 @@ def _validate_ticker(ticker):
     ticker = ticker.upper().strip()
     
     # Basic ticker validation (1-5 alphanumeric characters)
-    if not re.match(r'^[A-Z0-9]{1,5}$', ticker):
-        logging.warning(f"Invalid ticker format: {ticker}")
+    if not _TICKER_RE.match(ticker):
+        logger.warning(f"Invalid ticker format: {ticker}")
         return None
         
     return ticker
@@ -51,13 +93,13 @@ def _validate_quarter(quarter):
         return None
         
     if not isinstance(quarter, str):
-        logging.error(f"Quarter must be string, got {type(quarter)}")
+        logger.error(f"Quarter must be string, got {type(quarter)}")
         return None
         
     quarter = quarter.upper().strip()
     
     if quarter not in ['Q1', 'Q2', 'Q3', 'Q4']:
-        logging.error(f"Invalid quarter: {quarter}. Must be Q1, Q2, Q3, or Q4")
+        logger.error(f"Invalid quarter: {quarter}. Must be Q1, Q2, Q3, or Q4")
         return None
         
     return quarter
@@ -71,16 +113,16 @@ def _validate_year(year):
         try:
             year = int(year)
         except ValueError:
-            logging.error(f"Invalid year format: {year}")
+            logger.error(f"Invalid year format: {year}")
             return None
     
     if not isinstance(year, int):
-        logging.error(f"Year must be integer, got {type(year)}")
+        logger.error(f"Year must be integer, got {type(year)}")
         return None
         
     current_year = datetime.datetime.now().year
     if year < 2000 or year > current_year:
-        logging.error(f"Year {year} out of reasonable range (2000-{current_year})")
+        logger.error(f"Year {year} out of reasonable range (2000-{current_year})")
         return None
         
     return year
@@ -110,17 +152,27 @@ def _is_valid_transcript_url(url):
         if 'fool.com' not in parsed.netloc:
             return False
             
-        # Check for transcript-specific patterns
-        transcript_patterns = [
-            'earnings-call-transcript',
-            'earnings/call-transcripts',
-            '/transcripts/'
-        ]
-        
-        return any(pattern in url.lower() for pattern in transcript_patterns)
+        url_lower = url.lower()
+        return any(marker in url_lower for marker in _TRANSCRIPT_URL_MARKERS)
     except Exception:
         return False
 
+def _is_structure_line(line):
+    """Return True for section, operator and speaker header lines."""
+    return bool(_SECTION_HEADER_RE.match(line) or _SPEAKER_HEADER_RE.match(line))
+
+def _extract_text_blocks(container):
+    """
+    Extract one line per paragraph or heading.
+    
+    Speaker headers are marked up inline (e.g. <strong>Name</strong> -- <em>Title</em>),
+    so joining each block's own text with spaces keeps a header on a single line.
+    """
+    blocks = container.find_all(_TEXT_BLOCK_TAGS)
+    if not blocks:
+        return container.get_text(separator='\n', strip=True)
+    return '\n'.join(block.get_text(' ', strip=True) for block in blocks)
+
 def _handle_request_with_retry(url, max_retries=3, base_delay=1):
     """Make HTTP request with retry logic and rate limiting."""
     for attempt in range(max_retries):
@@ -128,14 +180,14 @@ def _handle_request_with_retry(url, max_retries=3, base_delay=1):
             # Random delay between requests to avoid rate limiting
             if attempt > 0:
                 delay = base_delay * (2 ** (attempt - 1)) + random.uniform(0.5, 1.5)
-                logging.info(f"Retry attempt {attempt + 1}, waiting {delay:.1f} seconds...")
+                logger.info(f"Retry attempt {attempt + 1}, waiting {delay:.1f} seconds...")
                 time.sleep(delay)
             
             headers = _get_random_headers()
-            response = requests.get(url, headers=headers, timeout=30)
+            response = _session.get(url, headers=headers, timeout=30)
             
             if response.status_code == 403:
-                logging.warning(f"Access forbidden (403) for {url}. May be blocked or rate limited.")
+                logger.warning(f"Access forbidden (403) for {url}. May be blocked or rate limited.")
                 if attempt < max_retries - 1:
                     continue
                 else:
@@ -147,7 +199,7 @@ def _handle_request_with_retry(url, max_retries=3, base_delay=1):
                     wait_time = int(retry_after)
                 except ValueError:
                     wait_time = 60
-                logging.warning(f"Rate limited (429). Waiting {wait_time} seconds...")
+                logger.warning(f"Rate limited (429). Waiting {wait_time} seconds...")
                 time.sleep(wait_time)
                 continue
                 
@@ -155,26 +207,26 @@ def _handle_request_with_retry(url, max_retries=3, base_delay=1):
             return response
             
         except requests.exceptions.Timeout:
-            logging.warning(f"Request timeout (attempt {attempt + 1}/{max_retries}) for {url}")
+            logger.warning(f"Request timeout (attempt {attempt + 1}/{max_retries}) for {url}")
             if attempt == max_retries - 1:
-                logging.error(f"Final timeout after {max_retries} attempts")
+                logger.error(f"Final timeout after {max_retries} attempts")
                 return None
                 
         except requests.exceptions.ConnectionError as e:
-            logging.warning(f"Connection error (attempt {attempt + 1}/{max_retries}): {e}")
+            logger.warning(f"Connection error (attempt {attempt + 1}/{max_retries}): {e}")
             if attempt == max_retries - 1:
-                logging.error(f"Final connection error after {max_retries} attempts")
+                logger.error(f"Final connection error after {max_retries} attempts")
                 return None
                 
         except requests.exceptions.HTTPError as e:
             if e.response.status_code in [403, 429]:
                 continue  # These are handled above
             else:
-                logging.error(f"HTTP Error {e.response.status_code}: {e}")
+                logger.error(f"HTTP Error {e.response.status_code}: {e}")
                 return None
                 
         except requests.exceptions.RequestException as e:
-            logging.error(f"Request error: {e}")
+            logger.error(f"Request error: {e}")
             return None
             
     return None
@@ -198,7 +250,7 @@ def fetch_transcript(ticker, quarter=None, year=None):
     # Validate inputs
     ticker = _validate_ticker(ticker)
     if not ticker:
-        logging.error("Invalid ticker provided to fetch_transcript")
+        logger.error("Invalid ticker provided to fetch_transcript")
         return None
         
     if quarter:
@@ -214,32 +266,32 @@ def fetch_transcript(ticker, quarter=None, year=None):
     try:
         # Find the transcript URL
         if quarter and year:
-            logging.info(f"Finding {quarter} {year} transcript for {ticker}...")
+            logger.info(f"Finding {quarter} {year} transcript for {ticker}...")
             transcript_url = find_transcript_url_by_quarter(ticker, quarter, year)
         else:
-            logging.info(f"Finding latest transcript for {ticker}...")
+            logger.info(f"Finding latest transcript for {ticker}...")
             transcript_url = find_latest_transcript_url(ticker)
             
         if not transcript_url:
-            logging.error(f"Could not find transcript URL for {ticker}")
+            logger.error(f"Could not find transcript URL for {ticker}")
             return None
             
         # Validate the URL
         if not _is_valid_transcript_url(transcript_url):
-            logging.error(f"Found URL does not appear to be a valid transcript: {transcript_url}")
+            logger.error(f"Found URL does not appear to be a valid transcript: {transcript_url}")
             return None
             
         # Scrape the transcript content
-        logging.info(f"Scraping transcript from {transcript_url}...")
+        logger.info(f"Scraping transcript from {transcript_url}...")
         transcript_text = get_transcript_from_fool(transcript_url)
         
         if not transcript_text:
-            logging.error(f"Could not scrape transcript content from {transcript_url}")
+            logger.error(f"Could not scrape transcript content from {transcript_url}")
             return None
             
         # Validate transcript content
         if len(transcript_text.strip()) < 500:  # Minimum reasonable transcript length
-            logging.warning(f"Transcript seems unusually short ({len(transcript_text)} chars) for {ticker}")
+            logger.warning(f"Transcript seems unusually short ({len(transcript_text)} chars) for {ticker}")
             
         # Parse call details from URL or use provided parameters
         call_date, parsed_quarter, parsed_year = _parse_call_details_from_url(transcript_url)
@@ -256,7 +308,7 @@ def fetch_transcript(ticker, quarter=None, year=None):
                 if month and _validate_date_components(year, month, 1):
                     call_date = datetime.date(year, month, 1)
             except Exception as e:
-                logging.warning(f"Could not construct date from quarter {quarter} and year {year}: {e}")
+                logger.warning(f"Could not construct date from quarter {quarter} and year {year}: {e}")
             
         return {
             'ticker': ticker,
@@ -268,7 +320,7 @@ def fetch_transcript(ticker, quarter=None, year=None):
         }
         
     except Exception as e:
-        logging.error(f"Error fetching transcript for {ticker}: {e}")
+        logger.error(f"Error fetching transcript for {ticker}: {e}")
         return None
 
 def find_latest_transcript_url(ticker):
@@ -296,14 +348,14 @@ def find_latest_transcript_url(ticker):
         
         for result in search_results:
             if _is_valid_transcript_url(result):
-                logging.info(f"Found latest transcript URL for {ticker}: {result}")
+                logger.info(f"Found latest transcript URL for {ticker}: {result}")
                 return result
                 
-        logging.warning(f"Could not find a valid transcript URL for {ticker} on fool.com.")
+        logger.warning(f"Could not find a valid transcript URL for {ticker} on fool.com.")
         return None
         
     except Exception as e:
-        logging.error(f"Error finding transcript URL for {ticker}: {e}")
+        logger.error(f"Error finding transcript URL for {ticker}: {e}")
         return None
 
 def find_transcript_url_by_quarter(ticker, quarter, year):
@@ -333,29 +385,25 @@ def find_transcript_url_by_quarter(ticker, quarter, year):
         time.sleep(random.uniform(1, 3))
         
         search_results = search(query, num_results=10, sleep_interval=2)
+        # Flexible matching for quarter and year
+        patterns = _quarter_url_patterns(ticker, quarter, year)
         
         for result in search_results:
             if not _is_valid_transcript_url(result):
                 continue
-                
-            # More flexible pattern matching for quarter and year
-            patterns = [
-                rf'-{re.escape(ticker.lower())}-{quarter.lower()}-{year}-earnings',
-                rf'{quarter.lower()}-{year}.*{ticker.lower()}.*earnings',
-                rf'{ticker.lower()}.*{quarter.lower()}.*{year}.*earnings'
-            ]
             
-            if any(re.search(pattern, result.lower()) for pattern in patterns):
-                logging.info(f"Found {quarter} {year} transcript URL for {ticker}: {result}")
+            if any(pattern.search(result.lower()) for pattern in patterns):
+                logger.info(f"Found {quarter} {year} transcript URL for {ticker}: {result}")
                 return result
                 
-        logging.warning(f"Could not find {quarter} {year} transcript URL for {ticker} on fool.com.")
+        logger.warning(f"Could not find {quarter} {year} transcript URL for {ticker} on fool.com.")
         return None
         
     except Exception as e:
-        logging.error(f"Error finding {quarter} {year} transcript URL for {ticker}: {e}")
+        logger.error(f"Error finding {quarter} {year} transcript URL for {ticker}: {e}")
         return None
 
+@response_cache.cached(endpoint="fool_transcript")  # Published transcripts don't change
 def get_transcript_from_fool(url):
     """
     Scrapes the earnings call transcript from a Motley Fool URL.
@@ -368,11 +416,11 @@ def get_transcript_from_fool(url):
         None: If scraping failed
     """
     if not url or not isinstance(url, str):
-        logging.error("Invalid URL provided to get_transcript_from_fool")
+        logger.error("Invalid URL provided to get_transcript_from_fool")
         return None
         
     if not _is_valid_transcript_url(url):
-        logging.error(f"URL does not appear to be a valid Motley Fool transcript: {url}")
+        logger.error(f"URL does not appear to be a valid Motley Fool transcript: {url}")
         return None
     
     try:
@@ -383,7 +431,7 @@ def get_transcript_from_fool(url):
         # Check content type
         content_type = response.headers.get('content-type', '').lower()
         if 'text/html' not in content_type:
-            logging.error(f"Expected HTML content, got {content_type}")
+            logger.error(f"Expected HTML content, got {content_type}")
             return None
             
         # Handle encoding properly
@@ -406,12 +454,12 @@ def get_transcript_from_fool(url):
         for selector in content_selectors:
             article_body = soup.select_one(selector)
             if article_body:
-                transcript_text = article_body.get_text(separator='\n', strip=True)
+                transcript_text = _extract_text_blocks(article_body)
                 break
                 
         if not transcript_text:
             # Fallback: try to extract any substantial text content
-            logging.warning(f"Could not find article body with standard selectors, trying fallback extraction")
+            logger.warning(f"Could not find article body with standard selectors, trying fallback extraction")
             
             # Remove script and style elements
             for script in soup(["script", "style", "nav", "header", "footer"]):
@@ -427,25 +475,27 @@ def get_transcript_from_fool(url):
         if transcript_text:
             # Clean up the text
             lines = transcript_text.split('\n')
-            # Remove very short lines that are likely navigation/ads
-            cleaned_lines = [line.strip() for line in lines if len(line.strip()) > 20]
+            # Remove very short lines that are likely navigation/ads, keeping the
+            # headers that _condense_transcript uses to find speaker turns
+            cleaned_lines = [line.strip() for line in lines
+                             if len(line.strip()) > 20 or _is_structure_line(line.strip())]
             transcript_text = '\n'.join(cleaned_lines)
             
             if len(transcript_text.strip()) < 500:
-                logging.warning(f"Extracted transcript seems very short: {len(transcript_text)} characters")
+                logger.warning(f"Extracted transcript seems very short: {len(transcript_text)} characters")
                 return None
                 
-            logging.info(f"Successfully scraped transcript from {url} ({len(transcript_text)} characters)")
+            logger.info(f"Successfully scraped transcript from {url} ({len(transcript_text)} characters)")
             return transcript_text
         else:
-            logging.warning(f"Could not find any substantial text content in the transcript at {url}")
+            logger.warning(f"Could not find any substantial text content in the transcript at {url}")
             return None
 
     except UnicodeDecodeError as e:
-        logging.error(f"Encoding error while scraping transcript from {url}: {e}")
+        logger.error(f"Encoding error while scraping transcript from {url}: {e}")
         return None
     except Exception as e:
-        logging.error(f"Unexpected error scraping transcript from {url}: {e}")
+        logger.error(f"Unexpected error scraping transcript from {url}: {e}")
         return None
 
 def batch_fetch_transcripts(tickers, quarter=None, year=None):
@@ -464,7 +514,7 @@ def batch_fetch_transcripts(tickers, quarter=None, year=None):
               Failed fetches will be None in the corresponding position.
     """
     if not tickers or not isinstance(tickers, list):
-        logging.error("Invalid tickers list provided to batch_fetch_transcripts")
+        logger.error("Invalid tickers list provided to batch_fetch_transcripts")
         return []
         
     # Validate quarter and year once
@@ -482,23 +532,23 @@ def batch_fetch_transcripts(tickers, quarter=None, year=None):
     
     for i, ticker in enumerate(tickers):
         if not ticker or not isinstance(ticker, str):
-            logging.warning(f"Skipping invalid ticker at position {i}: {ticker}")
+            logger.warning(f"Skipping invalid ticker at position {i}: {ticker}")
             results.append(None)
             continue
             
-        logging.info(f"Processing ticker {i+1}/{len(tickers)}: {ticker}")
+        logger.info(f"Processing ticker {i+1}/{len(tickers)}: {ticker}")
         
         try:
             result = fetch_transcript(ticker, quarter, year)
             results.append(result)
         except Exception as e:
-            logging.error(f"Error processing ticker {ticker}: {e}")
+            logger.error(f"Error processing ticker {ticker}: {e}")
             results.append(None)
         
         # Rate limiting: wait between requests
         if i < len(tickers) - 1:  # Don't sleep after last request
             delay = random.uniform(3, 7)  # Random delay to appear more human-like
-            logging.debug(f"Waiting {delay:.1f} seconds before next request...")
+            logger.debug(f"Waiting {delay:.1f} seconds before next request...")
             time.sleep(delay)
         
     return results
@@ -520,11 +570,11 @@ def search_transcripts_by_keywords(ticker, keywords, max_results=5):
         return []
         
     if not keywords or not isinstance(keywords, list):
-        logging.error("Keywords must be a non-empty list")
+        logger.error("Keywords must be a non-empty list")
         return []
         
     if not isinstance(max_results, int) or max_results < 1:
-        logging.error("max_results must be a positive integer")
+        logger.error("max_results must be a positive integer")
         return []
     
     keywords_str = " ".join(str(kw) for kw in keywords)
@@ -541,11 +591,11 @@ def search_transcripts_by_keywords(ticker, keywords, max_results=5):
             if _is_valid_transcript_url(result):
                 urls.append(result)
                 
-        logging.info(f"Found {len(urls)} transcript URLs for {ticker} with keywords: {keywords}")
+        logger.info(f"Found {len(urls)} transcript URLs for {ticker} with keywords: {keywords}")
         return urls
         
     except Exception as e:
-        logging.error(f"Error searching for transcripts with keywords {keywords} for {ticker}: {e}")
+        logger.error(f"Error searching for transcripts with keywords {keywords} for {ticker}: {e}")
         return []
 
 def validate_transcript_result(transcript_result):
@@ -601,18 +651,8 @@ def get_transcript_metadata_from_url(url):
         return None
     
     try:
-        # Multiple patterns to handle different URL formats
-        patterns = [
-            # Pattern: /earnings/call-transcripts/YYYY/MM/DD/company-ticker-q#-YYYY-earnings-call-transcript/
-            r'/earnings/call-transcripts/(\d{4})/(\d{2})/(\d{2})/.*-([a-zA-Z]+)-q(\d)-(\d{4})-earnings-call-transcript',
-            # Alternative pattern: /transcripts/YYYY/MM/DD/ticker-q#-YYYY/
-            r'/transcripts/(\d{4})/(\d{2})/(\d{2})/([a-zA-Z]+)-q(\d)-(\d{4})',
-            # More flexible pattern
-            r'(\d{4})/(\d{2})/(\d{2}).*([a-zA-Z]{2,5}).*q(\d).*(\d{4})'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url, re.IGNORECASE)
+        for pattern in _TRANSCRIPT_URL_PATTERNS:
+            match = pattern.search(url)
             if match:
                 groups = match.groups()
                 
@@ -638,11 +678,11 @@ def get_transcript_metadata_from_url(url):
                         'day': int(day)
                     }
         
-        logging.warning(f"Could not extract metadata from URL: {url}")
+        logger.warning(f"Could not extract metadata from URL: {url}")
         return None
             
     except Exception as e:
-        logging.error(f"Error extracting metadata from URL {url}: {e}")
+        logger.error(f"Error extracting metadata from URL {url}: {e}")
         return None
 
 def _parse_call_details_from_url(transcript_url):
@@ -674,7 +714,7 @@ def _parse_call_details_from_url(transcript_url):
                 if _validate_date_components(url_year, url_month, url_day):
                     call_date = datetime.date(url_year, url_month, url_day)
     except Exception as e:
-        logging.warning(f"Could not parse date/quarter/year from URL: {e}")
+        logger.warning(f"Could not parse date/quarter/year from URL: {e}")
     
     return call_date, quarter, year
 
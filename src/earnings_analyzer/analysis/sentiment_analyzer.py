@@ -1,13 +1,16 @@
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 import json
 import logging
+import random
 import time
 import re
+import threading
 from typing import Dict, List, Optional, Union
 from earnings_analyzer.config import get_gemini_api_key
+from earnings_analyzer.utils.cache import response_cache
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
 
 # Available Gemini models (as of 2024)
 VALID_GEMINI_MODELS = {
@@ -17,10 +20,42 @@ VALID_GEMINI_MODELS = {
     'gemini-pro'
 }
 
+# Models that predate JSON mode and reject response_mime_type/response_schema
+_NO_STRUCTURED_OUTPUT_MODELS = {'gemini-pro', 'gemini-1.0-pro'}
+
+# Cached Gemini analyses are keyed on model and full prompt, so any prompt change invalidates them
+SENTIMENT_CACHE_TTL_DAYS = 90
+
+# Transcript input budgets, estimated at ~4 characters per token. These match the
+# previous hard caps of 25,000 (default prompt) and 30,000 (custom prompt) characters.
+CHARS_PER_TOKEN = 4
+DEFAULT_MAX_TRANSCRIPT_TOKENS = 6250
+CUSTOM_PROMPT_MAX_TRANSCRIPT_TOKENS = 7500
+
+# Lines that carry no sentiment signal: operator chatter and publisher/legal boilerplate
+_BOILERPLATE_PATTERNS = [
+    re.compile(r'forward-looking statements', re.IGNORECASE),
+    re.compile(r'this article is a transcript of this conference call', re.IGNORECASE),
+    re.compile(r'the motley fool (?:has a disclosure policy|has positions in|recommends)', re.IGNORECASE),
+    re.compile(r'^image source:', re.IGNORECASE),
+]
+_WHITESPACE_RE = re.compile(r'\s+')
+_QA_HEADER_RE = re.compile(r'^questions?\s*(?:&|and)\s*answers?\s*:?$', re.IGNORECASE)
+# Motley Fool speaker headers look like "Jane Doe -- Chief Financial Officer"
+_SPEAKER_LINE_RE = re.compile(r'^[A-Z][\w.\'\- ]{1,60} -- \S.{0,80}$')
+# The operator's header is a bare "Operator" line; everything up to the next speaker header is theirs
+_OPERATOR_LINE_RE = re.compile(r'^operator\b', re.IGNORECASE)
+
 # Rate limiting tracking
 _last_request_time = 0
 _request_count = 0
 _rate_limit_window_start = 0
+_rate_limit_lock = threading.Lock()
+
+# Configured API key and model instances, reused across requests
+_configured_api_key = None
+_models = {}
+_model_lock = threading.Lock()
 
 def _validate_model_name(model_name):
     """Validate that the model name is supported."""
@@ -36,36 +71,150 @@ def _validate_model_name(model_name):
     if base_model in VALID_GEMINI_MODELS:
         return True
         
-    logging.warning(f"Model '{model_name}' not in known model list. Proceeding anyway.")
+    logger.warning(f"Model '{model_name}' not in known model list. Proceeding anyway.")
     return True  # Allow unknown models but warn
 
 def _handle_rate_limiting():
     """Handle rate limiting for Gemini API requests."""
     global _last_request_time, _request_count, _rate_limit_window_start
     
-    current_time = time.time()
-    
-    # Reset counter every minute
-    if current_time - _rate_limit_window_start > 60:
-        _request_count = 0
-        _rate_limit_window_start = current_time
-    
-    # Gemini free tier: 15 requests per minute
-    if _request_count >= 15:
-        wait_time = 60 - (current_time - _rate_limit_window_start)
-        if wait_time > 0:
-            logging.info(f"Rate limit reached. Waiting {wait_time:.1f} seconds...")
-            time.sleep(wait_time)
+    # Serialize callers so concurrent analyses share a single request budget
+    with _rate_limit_lock:
+        current_time = time.time()
+        
+        # Reset counter every minute
+        if current_time - _rate_limit_window_start > 60:
             _request_count = 0
-            _rate_limit_window_start = time.time()
+            _rate_limit_window_start = current_time
+        
+        # Gemini free tier: 15 requests per minute
+        if _request_count >= 15:
+            wait_time = 60 - (current_time - _rate_limit_window_start)
+            if wait_time > 0:
+                logger.info(f"Rate limit reached. Waiting {wait_time:.1f} seconds...")
+                time.sleep(wait_time)
+                _request_count = 0
+                _rate_limit_window_start = time.time()
+        
+        # Ensure minimum 1 second between requests
+        time_since_last = time.time() - _last_request_time
+        if time_since_last < 1.0:
+            time.sleep(1.0 - time_since_last)
+        
+        _last_request_time = time.time()
+        _request_count += 1
+
+def _get_model(api_key, model_name):
+    """Return a cached GenerativeModel, configuring the client only when the API key changes."""
+    global _configured_api_key
+    
+    with _model_lock:
+        if api_key != _configured_api_key:
+            genai.configure(api_key=api_key)
+            _configured_api_key = api_key
+            _models.clear()
+        
+        model = _models.get(model_name)
+        if model is None:
+            model = genai.GenerativeModel(model_name)
+            _models[model_name] = model
+        return model
+
+def _condense_transcript(transcript_text, max_tokens=DEFAULT_MAX_TRANSCRIPT_TOKENS):
+    """
+    Shrink a transcript to fit the prompt budget while keeping the most informative text.
     
-    # Ensure minimum 1 second between requests
-    time_since_last = current_time - _last_request_time
-    if time_since_last < 1.0:
-        time.sleep(1.0 - time_since_last)
+    Operator turns, disclaimers and repeated lines are dropped and whitespace is
+    collapsed. If the result is still over budget, prepared remarks are kept and the
+    Q&A section is cut at a speaker turn boundary rather than mid-answer.
+    """
+    lines = []
+    seen = set()
+    in_operator_turn = False
+    for raw_line in transcript_text.splitlines():
+        line = _WHITESPACE_RE.sub(' ', raw_line).strip()
+        if not line:
+            continue
+        # Drop the whole operator turn so its text isn't merged into the previous speaker's
+        if _OPERATOR_LINE_RE.match(line):
+            in_operator_turn = True
+            continue
+        if in_operator_turn:
+            if not (_SPEAKER_LINE_RE.match(line) or _QA_HEADER_RE.match(line)):
+                continue
+            in_operator_turn = False
+        if any(pattern.search(line) for pattern in _BOILERPLATE_PATTERNS):
+            continue
+        # Speaker headers legitimately repeat; any other repeated line is boilerplate
+        if not _SPEAKER_LINE_RE.match(line):
+            if line in seen:
+                continue
+            seen.add(line)
+        lines.append(line)
+    
+    condensed = "\n".join(lines)
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(condensed) <= max_chars:
+        return condensed
+    
+    qa_start = next((i for i, line in enumerate(lines) if _QA_HEADER_RE.match(line)), None)
+    prepared_remarks = "\n".join(lines[:qa_start]) if qa_start is not None else condensed
+    
+    if qa_start is None or len(prepared_remarks) >= max_chars:
+        logger.warning(f"Transcript is very long, truncating to {max_chars} characters")
+        return condensed[:max_chars] + "..."
+    
+    # Split Q&A into speaker turns and keep whole turns while they fit
+    turns = []
+    for line in lines[qa_start + 1:]:
+        if not turns or _SPEAKER_LINE_RE.match(line):
+            turns.append([])
+        turns[-1].append(line)
+    
+    kept = [prepared_remarks, lines[qa_start]]
+    used = len(prepared_remarks) + 1 + len(lines[qa_start])
+    for turn in turns:
+        turn_text = "\n".join(turn)
+        if used + 1 + len(turn_text) > max_chars:
+            if len(turns) == 1:
+                # No speaker boundaries found; fall back to a plain cut
+                kept.append(turn_text[:max_chars - used - 1])
+            break
+        kept.append(turn_text)
+        used += 1 + len(turn_text)
+    
+    condensed = "\n".join(kept)
+    logger.info(f"Condensed transcript from {len(transcript_text)} to {len(condensed)} characters")
+    return condensed
+
+def _supports_json_output(model_name):
+    """Return False for models known to reject response_mime_type/response_schema."""
+    return re.sub(r'-\d{3}$', '', model_name) not in _NO_STRUCTURED_OUTPUT_MODELS
+
+def _build_response_schema(include_key_themes=True, include_qualitative_assessment=True):
+    """Build the Gemini response schema matching the default sentiment prompt."""
+    properties = {
+        'overall_sentiment_score': {'type': 'number'},
+        'confidence_level': {'type': 'number'}
+    }
+    
+    if include_key_themes:
+        properties['key_themes'] = {'type': 'array', 'items': {'type': 'string'}}
+    if include_qualitative_assessment:
+        properties['qualitative_assessment'] = {'type': 'string'}
     
-    _last_request_time = time.time()
-    _request_count += 1
+    return {
+        'type': 'object',
+        'properties': properties,
+        'required': list(properties.keys())
+    }
+
+def _parse_json_response(response_text):
+    """Parse a JSON-mode Gemini response, falling back to text extraction for free-form output."""
+    try:
+        return json.loads(response_text)
+    except (json.JSONDecodeError, TypeError):
+        return _sanitize_json_response(response_text)
 
 def _sanitize_json_response(response_text):
     """Clean and extract JSON from Gemini response."""
@@ -105,53 +254,93 @@ def _validate_sentiment_response(data, expected_fields):
     # Check required fields
     for field in expected_fields:
         if field not in data:
-            logging.warning(f"Missing required field in sentiment response: {field}")
+            logger.warning(f"Missing required field in sentiment response: {field}")
             return False
     
     # Validate data types and ranges
     if 'overall_sentiment_score' in data:
         score = data['overall_sentiment_score']
         if not isinstance(score, (int, float)) or not (1 <= score <= 10):
-            logging.warning(f"Invalid sentiment score: {score}. Must be number between 1-10")
+            logger.warning(f"Invalid sentiment score: {score}. Must be number between 1-10")
             return False
     
     if 'confidence_level' in data:
         confidence = data['confidence_level']
         if not isinstance(confidence, (int, float)) or not (0.0 <= confidence <= 1.0):
-            logging.warning(f"Invalid confidence level: {confidence}. Must be number between 0.0-1.0")
+            logger.warning(f"Invalid confidence level: {confidence}. Must be number between 0.0-1.0")
             return False
     
     if 'key_themes' in data:
         themes = data['key_themes']
         if not isinstance(themes, list):
-            logging.warning(f"Invalid key_themes format: {type(themes)}. Must be list")
+            logger.warning(f"Invalid key_themes format: {type(themes)}. Must be list")
             return False
         
         # Validate individual themes
         for theme in themes:
             if not isinstance(theme, str) or len(theme.strip()) == 0:
-                logging.warning(f"Invalid theme in key_themes: {theme}")
+                logger.warning(f"Invalid theme in key_themes: {theme}")
                 return False
     
     return True
 
-def _make_gemini_request(model, prompt, max_retries=3):
-    """Make request to Gemini API with retry logic and error handling."""
+# Transient Gemini errors worth retrying: rate limiting (429), overload (503) and timeouts
+_RETRYABLE_GEMINI_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+)
+
+def _call_with_retry(fn, max_attempts=5, base_delay=1.0):
+    """
+    Call fn, retrying transient Gemini errors with exponential backoff and jitter.
+    
+    The random jitter keeps concurrent batch workers from retrying in lockstep.
+    Other exceptions, and the last transient error once max_attempts is reached,
+    are re-raised to the caller.
+    """
+    for attempt in range(max_attempts):
+        try:
+            return fn()
+        except _RETRYABLE_GEMINI_ERRORS as e:
+            if attempt == max_attempts - 1:
+                raise
+            delay = base_delay * 2 ** attempt * random.uniform(0.5, 1.5)
+            logger.warning(f"Transient Gemini error ({type(e).__name__}), retrying in {delay:.1f}s "
+                            f"(attempt {attempt + 1}/{max_attempts})")
+            time.sleep(delay)
+
+def _make_gemini_request(model, prompt, max_retries=3, json_output=False, response_schema=None):
+    """
+    Make request to Gemini API with retry logic and error handling.
+    
+    When json_output is True the model is asked for application/json output,
+    constrained to response_schema if one is given, so the reply parses directly.
+    """
+    config_kwargs = {
+        'temperature': 0.1,  # Low temperature for consistent results
+        'max_output_tokens': 2048,
+        'candidate_count': 1
+    }
+    if json_output:
+        config_kwargs['response_mime_type'] = 'application/json'
+        if response_schema:
+            config_kwargs['response_schema'] = response_schema
+    generation_config = genai.types.GenerationConfig(**config_kwargs)
+    
+    def generate():
+        _handle_rate_limiting()
+        return model.generate_content(
+            prompt,
+            generation_config=generation_config
+        )
+    
     for attempt in range(max_retries):
         try:
-            _handle_rate_limiting()
-            
-            response = model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.1,  # Low temperature for consistent results
-                    max_output_tokens=2048,
-                    candidate_count=1
-                )
-            )
+            response = _call_with_retry(generate)
             
             if not response or not response.text:
-                logging.warning(f"Empty response from Gemini (attempt {attempt + 1}/{max_retries})")
+                logger.warning(f"Empty response from Gemini (attempt {attempt + 1}/{max_retries})")
                 if attempt < max_retries - 1:
                     time.sleep(2 ** attempt)  # Exponential backoff
                     continue
@@ -159,30 +348,46 @@ def _make_gemini_request(model, prompt, max_retries=3):
             
             return response
             
+        except _RETRYABLE_GEMINI_ERRORS as e:
+            # _call_with_retry has already backed off; don't multiply the retries
+            logger.error(f"Gemini API still unavailable after retries: {e}")
+            return None
+            
         except Exception as e:
             error_msg = str(e).lower()
             
+            # Models outside _NO_STRUCTURED_OUTPUT_MODELS may still reject JSON mode;
+            # fall back to plain text, which _parse_json_response can still extract from
+            if (json_output and isinstance(e, google_exceptions.InvalidArgument)
+                    and any(term in error_msg for term in ('json', 'mime', 'schema'))):
+                logger.warning(f"Model rejected JSON output mode, retrying as plain text: {e}")
+                json_output = False
+                config_kwargs.pop('response_mime_type', None)
+                config_kwargs.pop('response_schema', None)
+                generation_config = genai.types.GenerationConfig(**config_kwargs)
+                continue
+            
             # Handle specific error types
             if 'quota' in error_msg or 'rate limit' in error_msg:
                 wait_time = 60 * (2 ** attempt)  # Exponential backoff for quota errors
-                logging.warning(f"API quota/rate limit hit. Waiting {wait_time} seconds...")
+                logger.warning(f"API quota/rate limit hit. Waiting {wait_time} seconds...")
                 time.sleep(wait_time)
                 continue
                 
             elif 'invalid api key' in error_msg or 'authentication' in error_msg:
-                logging.error("Invalid Gemini API key. Please check your GEMINI_API_KEY environment variable.")
+                logger.error("Invalid Gemini API key. Please check your GEMINI_API_KEY environment variable.")
                 return None
                 
             elif 'safety' in error_msg or 'blocked' in error_msg:
-                logging.error("Content was blocked by Gemini safety filters")
+                logger.error("Content was blocked by Gemini safety filters")
                 return None
                 
             elif attempt < max_retries - 1:
-                logging.warning(f"Gemini API error (attempt {attempt + 1}/{max_retries}): {e}")
+                logger.warning(f"Gemini API error (attempt {attempt + 1}/{max_retries}): {e}")
                 time.sleep(2 ** attempt)  # Exponential backoff
                 continue
             else:
-                logging.error(f"Final Gemini API error after {max_retries} attempts: {e}")
+                logger.error(f"Final Gemini API error after {max_retries} attempts: {e}")
                 return None
     
     return None
@@ -221,36 +426,34 @@ def score_sentiment(transcript_text: str, model_name: str = "gemini-2.5-flash",
     """
     # Input validation
     if not transcript_text or not isinstance(transcript_text, str):
-        logging.error("transcript_text must be a non-empty string")
+        logger.error("transcript_text must be a non-empty string")
         return None
         
     transcript_text = transcript_text.strip()
     if len(transcript_text) < 100:
-        logging.warning(f"Transcript text is very short ({len(transcript_text)} chars). Results may be unreliable.")
+        logger.warning(f"Transcript text is very short ({len(transcript_text)} chars). Results may be unreliable.")
     
     if not _validate_model_name(model_name):
-        logging.error(f"Invalid model name: {model_name}")
+        logger.error(f"Invalid model name: {model_name}")
         return None
 
     # Check API key
     api_key = get_gemini_api_key()
     if not api_key:
-        logging.error("GEMINI_API_KEY is not set in the environment variables. Please set it to use Gemini API.")
+        logger.error("GEMINI_API_KEY is not set in the environment variables. Please set it to use Gemini API.")
         return None
 
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel(model_name)
+        model = _get_model(api_key, model_name)
         
         if custom_prompt:
             # Use custom prompt exactly as provided
-            if len(transcript_text) > 30000:  # Truncate very long transcripts
-                logging.warning("Transcript is very long, truncating to 30000 characters")
-                transcript_text = transcript_text[:30000] + "..."
+            transcript_text = _condense_transcript(transcript_text, CUSTOM_PROMPT_MAX_TRANSCRIPT_TOKENS)
                 
             prompt = f"{custom_prompt}\n\nTranscript:\n---\n{transcript_text}\n---"
-            logging.info("Using custom prompt for sentiment analysis")
+            logger.info("Using custom prompt for sentiment analysis")
             expected_fields = []  # Can't validate custom prompt structure
+            response_schema = None  # Structure is defined by the custom prompt
         else:
             # Use default prompt with configurable options
             prompt_parts = [
@@ -288,10 +491,8 @@ def score_sentiment(transcript_text: str, model_name: str = "gemini-2.5-flash",
                 "Ensure all string values are properly escaped and the JSON is valid."
             ])
             
-            # Truncate transcript if too long
-            if len(transcript_text) > 25000:  # Leave room for prompt
-                logging.warning("Transcript is very long, truncating to 25000 characters")
-                transcript_text = transcript_text[:25000] + "..."
+            # Condense transcript to leave room for the prompt
+            transcript_text = _condense_transcript(transcript_text, DEFAULT_MAX_TRANSCRIPT_TOKENS)
             
             # Construct full prompt
             prompt = "\n".join(prompt_parts + field_descriptions + [
@@ -301,31 +502,47 @@ def score_sentiment(transcript_text: str, model_name: str = "gemini-2.5-flash",
                 transcript_text,
                 "---"
             ])
+            response_schema = _build_response_schema(include_key_themes, include_qualitative_assessment)
         
-        response = _make_gemini_request(model, prompt)
-        if not response:
-            logging.error("Failed to get response from Gemini API")
-            return None
-            
-        # Parse JSON response
-        analysis_result = _sanitize_json_response(response.text)
+        cache_key = f"{model_name}\n{prompt}"
+        analysis_result = response_cache.get("gemini_sentiment", cache_key, ttl_days=SENTIMENT_CACHE_TTL_DAYS)
+        # Only fresh responses are written back; rewriting a hit would reset its age
+        from_cache = analysis_result is not None
         
-        if analysis_result is None:
-            logging.error(f"Failed to parse JSON from Gemini response. Raw response: {response.text[:500]}...")
-            return None
+        if from_cache:
+            logger.info("Using cached Gemini response for this transcript and prompt")
+        else:
+            json_output = _supports_json_output(model_name)
+            response = _make_gemini_request(model, prompt, json_output=json_output,
+                                            response_schema=response_schema if json_output else None)
+            if not response:
+                logger.error("Failed to get response from Gemini API")
+                return None
+                
+            # Parse JSON response
+            analysis_result = _parse_json_response(response.text)
+            
+            if analysis_result is None:
+                logger.error(f"Failed to parse JSON from Gemini response. Raw response: {response.text[:500]}...")
+                return None
         
         if custom_prompt:
             # For custom prompts, we can't validate expected fields since we don't know the structure
             # Just add model_name and return whatever Gemini provided
+            if not from_cache:
+                response_cache.set("gemini_sentiment", cache_key, analysis_result)
             analysis_result['model_name'] = model_name
-            logging.info("Successfully completed custom prompt sentiment analysis")
+            logger.info("Successfully completed custom prompt sentiment analysis")
             return analysis_result
         else:
             # Validate the expected fields are present for default prompt
             if not _validate_sentiment_response(analysis_result, expected_fields):
-                logging.error("Gemini response failed validation")
+                logger.error("Gemini response failed validation")
                 return None
             
+            if not from_cache:
+                response_cache.set("gemini_sentiment", cache_key, analysis_result)
+            
             # Ensure optional fields are always present (empty if not included)
             if not include_key_themes:
                 analysis_result['key_themes'] = []
@@ -335,11 +552,11 @@ def score_sentiment(transcript_text: str, model_name: str = "gemini-2.5-flash",
             # Add model name to result
             analysis_result['model_name'] = model_name
                 
-            logging.info(f"Successfully analyzed sentiment with score: {analysis_result.get('overall_sentiment_score')}")
+            logger.info(f"Successfully analyzed sentiment with score: {analysis_result.get('overall_sentiment_score')}")
             return analysis_result
         
     except Exception as e:
-        logging.error(f"Unexpected error during sentiment analysis: {e}")
+        logger.error(f"Unexpected error during sentiment analysis: {e}")
         return None
 
 def batch_score_sentiment(transcripts: List[Union[str, Dict]], model_name: str = "gemini-2.5-flash", 
@@ -363,26 +580,26 @@ def batch_score_sentiment(transcripts: List[Union[str, Dict]], model_name: str =
               Failed analyses will be None in the corresponding position.
     """
     if not transcripts or not isinstance(transcripts, list):
-        logging.error("transcripts must be a non-empty list")
+        logger.error("transcripts must be a non-empty list")
         return []
     
     results = []
     
     for i, transcript in enumerate(transcripts):
-        logging.info(f"Processing transcript {i+1}/{len(transcripts)}")
+        logger.info(f"Processing transcript {i+1}/{len(transcripts)}")
         
         try:
             # Handle both string transcripts and dict objects
             if isinstance(transcript, dict):
                 transcript_text = transcript.get('transcript_text', '')
                 if not transcript_text:
-                    logging.warning(f"Transcript {i+1} has no 'transcript_text' field")
+                    logger.warning(f"Transcript {i+1} has no 'transcript_text' field")
                     results.append(None)
                     continue
             elif isinstance(transcript, str):
                 transcript_text = transcript
             else:
-                logging.warning(f"Invalid transcript type at position {i+1}: {type(transcript)}")
+                logger.warning(f"Invalid transcript type at position {i+1}: {type(transcript)}")
                 results.append(None)
                 continue
                 
@@ -391,7 +608,7 @@ def batch_score_sentiment(transcripts: List[Union[str, Dict]], model_name: str =
             results.append(result)
             
         except Exception as e:
-            logging.error(f"Error processing transcript {i+1}: {e}")
+            logger.error(f"Error processing transcript {i+1}: {e}")
             results.append(None)
         
         # Small delay between requests to be respectful to API
@@ -442,20 +659,20 @@ def get_sentiment_summary(sentiment_results: List[Dict]) -> Optional[Dict]:
         None: If no valid results provided
     """
     if not sentiment_results or not isinstance(sentiment_results, list):
-        logging.error("sentiment_results must be a non-empty list")
+        logger.error("sentiment_results must be a non-empty list")
         return None
         
     valid_results = [r for r in sentiment_results if r and validate_sentiment_result(r)]
     
     if not valid_results:
-        logging.warning("No valid sentiment results found for summary")
+        logger.warning("No valid sentiment results found for summary")
         return None
     
     # Only summarize results with standard structure (not custom prompts)
     standard_results = [r for r in valid_results if 'overall_sentiment_score' in r]
     
     if not standard_results:
-        logging.warning("No standard sentiment results found for summary")
+        logger.warning("No standard sentiment results found for summary")
         return {
             'total_analyses': len(valid_results),
             'standard_analyses': 0,
@@ -505,11 +722,11 @@ def compare_sentiment_trends(sentiment_results: List[Dict], sort_by_date: bool =
         None: If insufficient data for trend analysis
     """
     if not sentiment_results or not isinstance(sentiment_results, list):
-        logging.error("sentiment_results must be a non-empty list")
+        logger.error("sentiment_results must be a non-empty list")
         return None
         
     if len(sentiment_results) < 2:
-        logging.warning("Need at least 2 sentiment results for trend analysis")
+        logger.warning("Need at least 2 sentiment results for trend analysis")
         return None
         
     valid_results = [r for r in sentiment_results if r and validate_sentiment_result(r)]
@@ -518,7 +735,7 @@ def compare_sentiment_trends(sentiment_results: List[Dict], sort_by_date: bool =
     standard_results = [r for r in valid_results if 'overall_sentiment_score' in r]
     
     if len(standard_results) < 2:
-        logging.warning("Need at least 2 valid standard sentiment results for trend analysis")
+        logger.warning("Need at least 2 valid standard sentiment results for trend analysis")
         return None
     
     if sort_by_date:
@@ -5,15 +5,20 @@ import logging
 from typing import Dict, List, Optional, Union
 import contextlib
 import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Import the canonical composable functions from their source modules
 from .analysis.fool_scraper import fetch_transcript
 from .analysis.sentiment_analyzer import score_sentiment
-from .data.financial_data_fetcher import fetch_company_profile, calculate_stock_performance, get_historical_prices
+from .data.financial_data_fetcher import fetch_company_profile, calculate_stock_performance, get_historical_prices, get_price_window
 from .data import database
 
-# Configure logging for analyzer
-logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+
+# JSONL checkpoint field holding the ticker as requested, which the profile symbol may not match
+_CHECKPOINT_TICKER_FIELD = "_input_ticker"
 
 
 class EarningsAnalyzer:
@@ -28,6 +33,9 @@ class EarningsAnalyzer:
     def __init__(self):
         """Initializes the EarningsAnalyzer and sets up the database."""
         self.conn = None
+        # The connection is shared with batch worker threads, so all database
+        # access goes through this lock
+        self._db_lock = threading.RLock()
         self._setup_database_connection()
         
         # Register cleanup on exit
@@ -37,23 +45,23 @@ class EarningsAnalyzer:
         """Set up database connection with proper error handling."""
         try:
             if not database.setup_database():
-                logging.error("Failed to setup database during initialization")
+                logger.error("Failed to setup database during initialization")
                 return
                 
-            self.conn = database.create_connection(database.DATABASE_FILE)
+            self.conn = database.create_connection(database.DATABASE_FILE, check_same_thread=False)
             if self.conn is None:
-                logging.error("Error: Could not establish a database connection.")
+                logger.error("Error: Could not establish a database connection.")
             else:
-                logging.info("Database connection established successfully")
+                logger.info("Database connection established successfully")
                 
         except Exception as e:
-            logging.error(f"Error during database setup or connection: {e}")
+            logger.error(f"Error during database setup or connection: {e}")
             self.conn = None
 
     def _ensure_connection(self):
         """Ensure database connection is active, reconnect if necessary."""
         if self.conn is None:
-            logging.warning("Database connection is None, attempting to reconnect...")
+            logger.warning("Database connection is None, attempting to reconnect...")
             self._setup_database_connection()
             return self.conn is not None
             
@@ -64,7 +72,7 @@ class EarningsAnalyzer:
             cursor.close()
             return True
         except Exception as e:
-            logging.warning(f"Database connection test failed: {e}. Attempting to reconnect...")
+            logger.warning(f"Database connection test failed: {e}. Attempting to reconnect...")
             self._cleanup()
             self._setup_database_connection()
             return self.conn is not None
@@ -74,9 +82,9 @@ class EarningsAnalyzer:
         if self.conn:
             try:
                 database.close_connection(self.conn)
-                logging.debug("Database connection closed")
+                logger.debug("Database connection closed")
             except Exception as e:
-                logging.error(f"Error closing database connection: {e}")
+                logger.error(f"Error closing database connection: {e}")
             finally:
                 self.conn = None
 
@@ -91,7 +99,7 @@ class EarningsAnalyzer:
         try:
             return json.loads(json_string)
         except (json.JSONDecodeError, TypeError) as e:
-            logging.warning(f"Failed to parse JSON string: {e}. Raw value: {json_string}")
+            logger.warning(f"Failed to parse JSON string: {e}. Raw value: {json_string}")
             return []
 
     def _safe_date_conversion(self, date_input):
@@ -111,13 +119,13 @@ class EarningsAnalyzer:
                         return datetime.datetime.strptime(date_input, fmt).date()
                     except ValueError:
                         continue
-                logging.warning(f"Could not parse date string: {date_input}")
+                logger.warning(f"Could not parse date string: {date_input}")
                 return None
             except Exception as e:
-                logging.error(f"Error parsing date {date_input}: {e}")
+                logger.error(f"Error parsing date {date_input}: {e}")
                 return None
         else:
-            logging.warning(f"Unsupported date type: {type(date_input)}")
+            logger.warning(f"Unsupported date type: {type(date_input)}")
             return None
 
     def analyze(self, ticker: str, quarter: Optional[str] = None, year: Optional[int] = None, 
@@ -140,75 +148,98 @@ class EarningsAnalyzer:
             None: If analysis failed
         """
         if not ticker or not isinstance(ticker, str):
-            logging.error("Invalid ticker provided to analyze()")
+            logger.error("Invalid ticker provided to analyze()")
             return None
             
         ticker = ticker.upper().strip()
         
         # Validate inputs
         if quarter and quarter.upper() not in ['Q1', 'Q2', 'Q3', 'Q4']:
-            logging.error(f"Invalid quarter: {quarter}. Must be Q1, Q2, Q3, or Q4")
+            logger.error(f"Invalid quarter: {quarter}. Must be Q1, Q2, Q3, or Q4")
             return None
             
         if year and (not isinstance(year, int) or year < 2000 or year > datetime.datetime.now().year):
-            logging.error(f"Invalid year: {year}")
+            logger.error(f"Invalid year: {year}")
             return None
 
+        # With the quarter given up front, a stored analysis can be returned before
+        # any scraping or API requests are made
+        if not custom_prompt and quarter and year:
+            existing_call = self._find_existing_call(ticker, quarter.upper().strip(), year)
+            if existing_call:
+                logger.info(f"Found existing analysis for {ticker} {quarter.upper()} {year}. Returning cached data.")
+                return self._format_existing_call_data(existing_call)
+
+        # The profile only depends on the ticker, so fetch it while the transcript
+        # search and scrape are in flight. Prices are fetched once the call date is known.
+        executor = ThreadPoolExecutor(max_workers=2)
         try:
+            profile_future = executor.submit(fetch_company_profile, ticker)
+
             # First, try to determine the call identity to check for existing data
             transcript_data = fetch_transcript(ticker, quarter, year)
             if not transcript_data:
-                logging.error(f"Could not fetch transcript for {ticker}. Aborting.")
+                logger.error(f"Could not fetch transcript for {ticker}. Aborting.")
                 return None
 
             final_quarter = transcript_data.get('quarter')
             final_year = transcript_data.get('year')
 
-            # Check for existing cached data (only if using default prompt and we have database connection)
-            if not custom_prompt and final_quarter and final_year and self._ensure_connection():
-                existing_call = database.select_earnings_call_by_ticker_quarter_year(
-                    self.conn, ticker, final_quarter, final_year
-                )
+            # Check for existing cached data (only if using default prompt and we have database connection).
+            # For the latest call the quarter is only known now, so the profile prefetch above still runs.
+            if not custom_prompt and final_quarter and final_year:
+                existing_call = self._find_existing_call(ticker, final_quarter, final_year)
                 if existing_call:
-                    logging.info(f"Found existing analysis for {ticker} {final_quarter} {final_year}. Returning cached data.")
+                    logger.info(f"Found existing analysis for {ticker} {final_quarter} {final_year}. Returning cached data.")
                     return self._format_existing_call_data(existing_call)
 
             if custom_prompt:
-                logging.info(f"--- Using custom prompt for {ticker} {final_quarter} {final_year} (no caching) ---")
+                logger.info(f"--- Using custom prompt for {ticker} {final_quarter} {final_year} (no caching) ---")
             else:
-                logging.info(f"--- No cached data found. Starting full analysis for {ticker} {final_quarter} {final_year} ---")
+                logger.info(f"--- No cached data found. Starting full analysis for {ticker} {final_quarter} {final_year} ---")
 
-            # Fetch all components using composable functions
-            profile = fetch_company_profile(ticker)
+            # Only the window around the call is needed for performance metrics;
+            # fetch it while the sentiment request runs
+            call_date = transcript_data.get('call_date')
+            price_window = get_price_window(call_date) if call_date else None
+            prices_future = None
+            if price_window:
+                from_date, to_date = price_window
+                prices_future = executor.submit(get_historical_prices, ticker,
+                                                from_date=from_date, to_date=to_date)
+
+            # Resolve the profile before spending a Gemini request
+            profile = profile_future.result()
             if not profile:
-                logging.error(f"Could not fetch profile for {ticker}. Aborting.")
+                logger.error(f"Could not fetch profile for {ticker}. Aborting.")
                 return None
 
             sentiment = score_sentiment(transcript_data['transcript_text'], model_name, custom_prompt)
             if not sentiment:
-                logging.error("Could not analyze sentiment. Aborting.")
+                logger.error("Could not analyze sentiment. Aborting.")
                 return None
 
             # For stock performance, we need historical prices
             stock_performance = None
-            call_date = transcript_data.get('call_date')
             
-            if call_date:
+            if prices_future:
                 try:
-                    historical_prices = get_historical_prices(ticker)
+                    historical_prices = prices_future.result()
                     if historical_prices:
                         stock_performance = calculate_stock_performance(ticker, call_date, historical_prices)
                     else:
-                        logging.warning(f"Could not fetch historical prices for {ticker}")
+                        logger.warning(f"Could not fetch historical prices for {ticker}")
                 except Exception as e:
-                    logging.warning(f"Error calculating stock performance for {ticker}: {e}")
+                    logger.warning(f"Error calculating stock performance for {ticker}: {e}")
 
             # Store in database (only if using default prompt and we have database connection)
-            if not custom_prompt and self._ensure_connection():
-                try:
-                    self._store_analysis_in_database(profile, transcript_data, sentiment, stock_performance, model_name)
-                except Exception as e:
-                    logging.warning(f"Failed to store analysis in database: {e}")
+            if not custom_prompt:
+                with self._db_lock:
+                    if self._ensure_connection():
+                        try:
+                            self._store_analysis_in_database(profile, transcript_data, sentiment, stock_performance, model_name)
+                        except Exception as e:
+                            logger.warning(f"Failed to store analysis in database: {e}")
 
             # Consolidate and return results
             return {
@@ -223,8 +254,11 @@ class EarningsAnalyzer:
             }
 
         except Exception as e:
-            logging.error(f"Unexpected error during analysis for {ticker}: {e}")
+            logger.error(f"Unexpected error during analysis for {ticker}: {e}")
             return None
+        finally:
+            # Don't block an early return on fetches whose results are no longer needed
+            executor.shutdown(wait=False, cancel_futures=True)
 
     def _format_existing_call_data(self, existing_call) -> Dict:
         """Format existing database record into the expected return format."""
@@ -257,86 +291,95 @@ class EarningsAnalyzer:
                 } if existing_call[12] is not None else None
             }
         except Exception as e:
-            logging.error(f"Error formatting existing call data: {e}")
+            logger.error(f"Error formatting existing call data: {e}")
             return {}
 
+    def _find_existing_call(self, ticker: str, quarter: str, year: int):
+        """Look up a stored analysis for a call, or return None if there is none or no database."""
+        with self._db_lock:
+            if not self._ensure_connection():
+                return None
+            return database.select_earnings_call_by_ticker_quarter_year(self.conn, ticker, quarter, year)
+
     def _store_analysis_in_database(self, profile: Dict, transcript_data: Dict, 
                                    sentiment: Dict, stock_performance: Optional[Dict], model_name: str):
         """Store analysis results in database with comprehensive error handling."""
         if not self.conn:
-            logging.warning("No database connection available for storing analysis")
+            logger.warning("No database connection available for storing analysis")
             return
 
         try:
-            # Store company info
-            company_data = (
-                profile.get('symbol'),
-                profile.get('companyName'),
-                profile.get('sector')
-            )
+            # Write all rows in a single transaction: one commit instead of one per insert
+            with self.conn:
+                # Store company info
+                company_data = (
+                    profile.get('symbol'),
+                    profile.get('companyName'),
+                    profile.get('sector')
+                )
             
-            # Check if company already exists
-            existing_company = database.select_company_by_ticker(self.conn, profile.get('symbol'))
-            if not existing_company:
-                database.insert_company(self.conn, company_data)
+                # Check if company already exists
+                existing_company = database.select_company_by_ticker(self.conn, profile.get('symbol'))
+                if not existing_company:
+                    database.insert_company(self.conn, company_data, commit=False)
 
-            # Store earnings call
-            call_date = self._safe_date_conversion(transcript_data.get('call_date'))
+                # Store earnings call
+                call_date = self._safe_date_conversion(transcript_data.get('call_date'))
                 
-            earnings_call_data = (
-                profile.get('symbol'),
-                call_date,
-                transcript_data.get('quarter'),
-                transcript_data.get('year'),
-                transcript_data.get('transcript_text'),
-                transcript_data.get('transcript_url')
-            )
+                earnings_call_data = (
+                    profile.get('symbol'),
+                    call_date,
+                    transcript_data.get('quarter'),
+                    transcript_data.get('year'),
+                    transcript_data.get('transcript_text'),
+                    transcript_data.get('transcript_url')
+                )
             
-            earnings_call_id = database.insert_earnings_call(self.conn, earnings_call_data)
-            if not earnings_call_id:
-                logging.warning("Failed to insert earnings call, skipping sentiment and performance storage")
-                return
+                earnings_call_id = database.insert_earnings_call(self.conn, earnings_call_data, commit=False)
+                if not earnings_call_id:
+                    logger.warning("Failed to insert earnings call, skipping sentiment and performance storage")
+                    return
 
-            # Store sentiment analysis
-            if sentiment:
-                try:
-                    key_themes = sentiment.get('key_themes', [])
-                    if isinstance(key_themes, list):
-                        key_themes_json = json.dumps(key_themes)
-                    else:
-                        key_themes_json = json.dumps([])
+                # Store sentiment analysis
+                if sentiment:
+                    try:
+                        key_themes = sentiment.get('key_themes', [])
+                        if isinstance(key_themes, list):
+                            key_themes_json = json.dumps(key_themes)
+                        else:
+                            key_themes_json = json.dumps([])
                         
-                    sentiment_data = (
-                        earnings_call_id,
-                        sentiment.get('overall_sentiment_score'),
-                        sentiment.get('confidence_level'),
-                        key_themes_json,
-                        model_name,
-                        sentiment.get('qualitative_assessment', '')
-                    )
-                    database.insert_sentiment_analysis(self.conn, sentiment_data)
-                except Exception as e:
-                    logging.warning(f"Failed to store sentiment analysis: {e}")
-
-            # Store stock performance
-            if earnings_call_id and stock_performance:
-                try:
-                    stock_performance_data = (
-                        earnings_call_id,
-                        stock_performance.get('price_at_call'),
-                        stock_performance.get('price_1_week'),
-                        stock_performance.get('price_1_month'),
-                        stock_performance.get('price_3_month'),
-                        stock_performance.get('performance_1_week'),
-                        stock_performance.get('performance_1_month'),
-                        stock_performance.get('performance_3_month')
-                    )
-                    database.insert_stock_performance(self.conn, stock_performance_data)
-                except Exception as e:
-                    logging.warning(f"Failed to store stock performance: {e}")
+                        sentiment_data = (
+                            earnings_call_id,
+                            sentiment.get('overall_sentiment_score'),
+                            sentiment.get('confidence_level'),
+                            key_themes_json,
+                            model_name,
+                            sentiment.get('qualitative_assessment', '')
+                        )
+                        database.insert_sentiment_analysis(self.conn, sentiment_data, commit=False)
+                    except Exception as e:
+                        logger.warning(f"Failed to store sentiment analysis: {e}")
+
+                # Store stock performance
+                if earnings_call_id and stock_performance:
+                    try:
+                        stock_performance_data = (
+                            earnings_call_id,
+                            stock_performance.get('price_at_call'),
+                            stock_performance.get('price_1_week'),
+                            stock_performance.get('price_1_month'),
+                            stock_performance.get('price_3_month'),
+                            stock_performance.get('performance_1_week'),
+                            stock_performance.get('performance_1_month'),
+                            stock_performance.get('performance_3_month')
+                        )
+                        database.insert_stock_performance(self.conn, stock_performance_data, commit=False)
+                    except Exception as e:
+                        logger.warning(f"Failed to store stock performance: {e}")
 
         except Exception as e:
-            logging.error(f"Error storing analysis in database: {e}")
+            logger.error(f"Error storing analysis in database: {e}")
 
     def get_existing_calls(self, ticker: str) -> List[Dict]:
         """
@@ -349,13 +392,13 @@ class EarningsAnalyzer:
             list: List of existing call dictionaries with metadata and analysis results
         """
         if not ticker or not isinstance(ticker, str):
-            logging.error("Invalid ticker provided to get_existing_calls()")
+            logger.error("Invalid ticker provided to get_existing_calls()")
             return []
             
         ticker = ticker.upper().strip()
         
         if not self._ensure_connection():
-            logging.error("Database connection not established. Cannot retrieve existing calls.")
+            logger.error("Database connection not established. Cannot retrieve existing calls.")
             return []
         
         try:
@@ -377,7 +420,7 @@ class EarningsAnalyzer:
             else:
                 return []
         except Exception as e:
-            logging.error(f"Error retrieving existing calls for {ticker}: {e}")
+            logger.error(f"Error retrieving existing calls for {ticker}: {e}")
             return []
 
     def get_all_calls(self) -> List[Dict]:
@@ -388,7 +431,7 @@ class EarningsAnalyzer:
             list: List of all call dictionaries with metadata and analysis results
         """
         if not self._ensure_connection():
-            logging.error("Database connection not established. Cannot retrieve calls.")
+            logger.error("Database connection not established. Cannot retrieve calls.")
             return []
         
         try:
@@ -410,7 +453,7 @@ class EarningsAnalyzer:
             else:
                 return []
         except Exception as e:
-            logging.error(f"Error retrieving all calls: {e}")
+            logger.error(f"Error retrieving all calls: {e}")
             return []
 
     def analyze_to_dataframe(self, ticker: str, quarter: Optional[str] = None, year: Optional[int] = None, 
@@ -436,60 +479,145 @@ class EarningsAnalyzer:
             if not analysis_results:
                 return pd.DataFrame()
 
-            profile_data = analysis_results.get('profile', {})
-            sentiment_data = analysis_results.get('sentiment', {})
-            stock_performance_data = analysis_results.get('stock_performance', {})
-
-            # Handle both default and custom prompt results
-            if custom_prompt:
-                # For custom prompts, we can't predict the structure, so create a flexible representation
-                df_row = {
-                    'Ticker': profile_data.get('symbol'),
-                    'Company Name': profile_data.get('companyName'),
-                    'Sector': profile_data.get('sector'),
-                    'Industry': profile_data.get('industry'),
-                    'Sentiment Model': sentiment_data.get('model_name'),
-                    'Custom Prompt Used': True,
-                    'Sentiment Results': str(sentiment_data),  # Convert to string for DataFrame compatibility
-                    'Price at Call': stock_performance_data.get('price_at_call') if stock_performance_data else None,
-                    '1 Week Performance': stock_performance_data.get('performance_1_week') if stock_performance_data else None,
-                    '1 Month Performance': stock_performance_data.get('performance_1_month') if stock_performance_data else None,
-                    '3 Month Performance': stock_performance_data.get('performance_3_month') if stock_performance_data else None,
-                    'Call Date': analysis_results.get('call_date'),
-                    'Quarter': analysis_results.get('quarter')
-                }
-            else:
-                # Default prompt structure
-                key_themes = sentiment_data.get('key_themes', [])
-                themes_str = ", ".join(key_themes) if isinstance(key_themes, list) else str(key_themes)
-                
-                df_row = {
-                    'Ticker': profile_data.get('symbol'),
-                    'Company Name': profile_data.get('companyName'),
-                    'Sector': profile_data.get('sector'),
-                    'Industry': profile_data.get('industry'),
-                    'Sentiment Model': sentiment_data.get('model_name'),
-                    'Custom Prompt Used': False,
-                    'Overall Sentiment Score': sentiment_data.get('overall_sentiment_score'),
-                    'Sentiment Confidence': sentiment_data.get('confidence_level'),
-                    'Key Themes': themes_str,
-                    'Qualitative Assessment': sentiment_data.get('qualitative_assessment'),
-                    'Price at Call': stock_performance_data.get('price_at_call') if stock_performance_data else None,
-                    '1 Week Performance': stock_performance_data.get('performance_1_week') if stock_performance_data else None,
-                    '1 Month Performance': stock_performance_data.get('performance_1_month') if stock_performance_data else None,
-                    '3 Month Performance': stock_performance_data.get('performance_3_month') if stock_performance_data else None,
-                    'Call Date': analysis_results.get('call_date'),
-                    'Quarter': analysis_results.get('quarter')
-                }
-
-            return pd.DataFrame([df_row])
+            return pd.DataFrame([self._flatten_analysis_results(analysis_results, custom_prompt)])
             
         except Exception as e:
-            logging.error(f"Error creating DataFrame for {ticker}: {e}")
+            logger.error(f"Error creating DataFrame for {ticker}: {e}")
+            return pd.DataFrame()
+
+    def analyze_to_dataframe_batch(self, tickers: List[str], quarter: Optional[str] = None, year: Optional[int] = None,
+                                   model_name: str = "gemini-2.5-flash", custom_prompt: Optional[str] = None,
+                                   max_workers: int = 4, output_jsonl: Optional[str] = None) -> pd.DataFrame:
+        """
+        Analyzes multiple tickers concurrently and returns all results as one DataFrame.
+        
+        Rows are collected in a list and the DataFrame is built once at the end, which
+        avoids repeatedly concatenating single-row DataFrames.
+        
+        Args:
+            tickers (list): List of stock ticker symbols
+            quarter (str, optional): Quarter like "Q1", "Q2", "Q3", "Q4"
+            year (int, optional): Year like 2024, 2023
+            model_name (str): Gemini model to use for sentiment analysis
+            custom_prompt (str, optional): Complete custom prompt for sentiment analysis. Overrides default prompt.
+            max_workers (int): Number of tickers to analyze concurrently
+            output_jsonl (str, optional): Checkpoint file. Each completed row is appended as one
+                JSON line tagged with the requested ticker, and tickers already present in the
+                file are loaded from it instead of being analyzed again, so an interrupted run resumes where it left off. Use a
+                separate file for each quarter/year/prompt combination.
+            
+        Returns:
+            pandas.DataFrame: One row per successfully analyzed ticker, in input order.
+                Repeated tickers are analyzed and returned once.
+        """
+        if not tickers or not isinstance(tickers, list):
+            logger.error("tickers must be a non-empty list")
             return pd.DataFrame()
+        
+        if not isinstance(max_workers, int) or max_workers < 1:
+            logger.error(f"Invalid max_workers: {max_workers}. Must be a positive integer")
+            return pd.DataFrame()
+        
+        # dict.fromkeys drops repeated tickers while keeping first-seen order
+        normalized = list(dict.fromkeys(t.upper().strip() if isinstance(t, str) else t for t in tickers))
+        rows_by_ticker = self._load_dataframe_checkpoint(output_jsonl) if output_jsonl else {}
+        
+        pending = [t for t in normalized if t not in rows_by_ticker]
+        if rows_by_ticker:
+            logger.info(f"Resuming from {output_jsonl}: {len(normalized) - len(pending)} tickers already analyzed")
+        
+        checkpoint = open(output_jsonl, 'a', encoding='utf-8') if output_jsonl and pending else contextlib.nullcontext()
+        with checkpoint:
+            for i, result in self._iter_batch_results(pending, quarter, year, model_name, custom_prompt, max_workers):
+                if not result:
+                    continue
+                
+                row = self._flatten_analysis_results(result, custom_prompt)
+                rows_by_ticker[pending[i]] = row
+                
+                if output_jsonl:
+                    # Record the requested ticker, since the profile symbol in the row can differ
+                    record = dict(row, **{_CHECKPOINT_TICKER_FIELD: pending[i]})
+                    checkpoint.write(json.dumps(record, default=str) + "\n")
+                    checkpoint.flush()
+        
+        rows = [rows_by_ticker[t] for t in normalized if t in rows_by_ticker]
+        return pd.DataFrame.from_records(rows)
+
+    def _load_dataframe_checkpoint(self, output_jsonl: str) -> Dict[str, Dict]:
+        """Load previously written rows from a JSONL checkpoint, keyed by requested ticker."""
+        rows_by_ticker = {}
+        try:
+            with open(output_jsonl, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Most likely a partial line from an interrupted write
+                        logger.warning(f"Skipping unreadable line {line_number} in {output_jsonl}")
+                        continue
+                    input_ticker = row.pop(_CHECKPOINT_TICKER_FIELD, None)
+                    if input_ticker:
+                        rows_by_ticker[str(input_ticker).upper()] = row
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not read checkpoint {output_jsonl}: {e}")
+        return rows_by_ticker
+
+    def _flatten_analysis_results(self, analysis_results: Dict, custom_prompt: Optional[str] = None) -> Dict:
+        """Flatten an analyze() result into a single DataFrame row."""
+        profile_data = analysis_results.get('profile', {})
+        sentiment_data = analysis_results.get('sentiment', {})
+        stock_performance_data = analysis_results.get('stock_performance', {})
+
+        # Handle both default and custom prompt results
+        if custom_prompt:
+            # For custom prompts, we can't predict the structure, so create a flexible representation
+            return {
+                'Ticker': profile_data.get('symbol'),
+                'Company Name': profile_data.get('companyName'),
+                'Sector': profile_data.get('sector'),
+                'Industry': profile_data.get('industry'),
+                'Sentiment Model': sentiment_data.get('model_name'),
+                'Custom Prompt Used': True,
+                'Sentiment Results': str(sentiment_data),  # Convert to string for DataFrame compatibility
+                'Price at Call': stock_performance_data.get('price_at_call') if stock_performance_data else None,
+                '1 Week Performance': stock_performance_data.get('performance_1_week') if stock_performance_data else None,
+                '1 Month Performance': stock_performance_data.get('performance_1_month') if stock_performance_data else None,
+                '3 Month Performance': stock_performance_data.get('performance_3_month') if stock_performance_data else None,
+                'Call Date': analysis_results.get('call_date'),
+                'Quarter': analysis_results.get('quarter')
+            }
+
+        # Default prompt structure
+        key_themes = sentiment_data.get('key_themes', [])
+        themes_str = ", ".join(key_themes) if isinstance(key_themes, list) else str(key_themes)
+        
+        return {
+            'Ticker': profile_data.get('symbol'),
+            'Company Name': profile_data.get('companyName'),
+            'Sector': profile_data.get('sector'),
+            'Industry': profile_data.get('industry'),
+            'Sentiment Model': sentiment_data.get('model_name'),
+            'Custom Prompt Used': False,
+            'Overall Sentiment Score': sentiment_data.get('overall_sentiment_score'),
+            'Sentiment Confidence': sentiment_data.get('confidence_level'),
+            'Key Themes': themes_str,
+            'Qualitative Assessment': sentiment_data.get('qualitative_assessment'),
+            'Price at Call': stock_performance_data.get('price_at_call') if stock_performance_data else None,
+            '1 Week Performance': stock_performance_data.get('performance_1_week') if stock_performance_data else None,
+            '1 Month Performance': stock_performance_data.get('performance_1_month') if stock_performance_data else None,
+            '3 Month Performance': stock_performance_data.get('performance_3_month') if stock_performance_data else None,
+            'Call Date': analysis_results.get('call_date'),
+            'Quarter': analysis_results.get('quarter')
+        }
 
     def batch_analyze(self, tickers: List[str], quarter: Optional[str] = None, year: Optional[int] = None, 
-                     model_name: str = "gemini-2.5-flash", custom_prompt: Optional[str] = None) -> List[Optional[Dict]]:
+                     model_name: str = "gemini-2.5-flash", custom_prompt: Optional[str] = None,
+                     max_workers: int = 1) -> List[Optional[Dict]]:
         """
         Performs analysis for multiple tickers and returns combined results.
         
@@ -499,32 +627,51 @@ class EarningsAnalyzer:
             year (int, optional): Year like 2024, 2023
             model_name (str): Gemini model to use for sentiment analysis
             custom_prompt (str, optional): Complete custom prompt for sentiment analysis. Overrides default prompt.
+            max_workers (int): Number of tickers to analyze concurrently. Defaults to 1 (sequential).
+                Gemini requests stay subject to the shared rate limiter regardless of this value.
             
         Returns:
             list: List of analysis results in the same order as input tickers
         """
         if not tickers or not isinstance(tickers, list):
-            logging.error("tickers must be a non-empty list")
+            logger.error("tickers must be a non-empty list")
             return []
         
-        results = []
+        if not isinstance(max_workers, int) or max_workers < 1:
+            logger.error(f"Invalid max_workers: {max_workers}. Must be a positive integer")
+            return []
         
-        for i, ticker in enumerate(tickers):
+        results = [None] * len(tickers)
+        for i, result in self._iter_batch_results(tickers, quarter, year, model_name, custom_prompt, max_workers):
+            results[i] = result
+            
+        return results
+
+    def _iter_batch_results(self, tickers: List[str], quarter: Optional[str], year: Optional[int],
+                            model_name: str, custom_prompt: Optional[str], max_workers: int):
+        """Yield (index, result) pairs as each ticker's analysis completes."""
+        def analyze_one(i, ticker):
             if not ticker or not isinstance(ticker, str):
-                logging.warning(f"Skipping invalid ticker at position {i}: {ticker}")
-                results.append(None)
-                continue
+                logger.warning(f"Skipping invalid ticker at position {i}: {ticker}")
+                return None
                 
-            logging.info(f"Analyzing ticker {i+1}/{len(tickers)}: {ticker}")
+            logger.info(f"Analyzing ticker {i+1}/{len(tickers)}: {ticker}")
             
             try:
-                result = self.analyze(ticker, quarter, year, model_name, custom_prompt)
-                results.append(result)
+                return self.analyze(ticker, quarter, year, model_name, custom_prompt)
             except Exception as e:
-                logging.error(f"Error analyzing ticker {ticker}: {e}")
-                results.append(None)
-            
-        return results
+                logger.error(f"Error analyzing ticker {ticker}: {e}")
+                return None
+
+        if max_workers == 1:
+            for i, ticker in enumerate(tickers):
+                yield i, analyze_one(i, ticker)
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(analyze_one, i, ticker): i for i, ticker in enumerate(tickers)}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
 
     def get_portfolio_summary(self, tickers: List[str]) -> Optional[Dict]:
         """
@@ -537,7 +684,7 @@ class EarningsAnalyzer:
             dict: Portfolio-level summary statistics
         """
         if not tickers or not isinstance(tickers, list):
-            logging.error("tickers must be a non-empty list")
+            logger.error("tickers must be a non-empty list")
             return None
         
         all_results = []
@@ -550,7 +697,7 @@ class EarningsAnalyzer:
                 calls = self.get_existing_calls(ticker.upper().strip())
                 all_results.extend(calls)
             except Exception as e:
-                logging.warning(f"Error getting calls for {ticker}: {e}")
+                logger.warning(f"Error getting calls for {ticker}: {e}")
                 continue
             
         if not all_results:
@@ -600,7 +747,7 @@ class EarningsAnalyzer:
         try:
             return database.get_database_stats(self.conn)
         except Exception as e:
-            logging.error(f"Error getting database stats: {e}")
+            logger.error(f"Error getting database stats: {e}")
             return None
 
     def __enter__(self):
@@ -64,8 +64,7 @@ from .data.financial_data_fetcher import (
 
 from .analyzer import EarningsAnalyzer
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
 
 # Core composable functions - these are the main API surface for in-memory usage
 __all__ = [
@@ -119,12 +118,12 @@ __all__ = [
 def _validate_ticker_input(ticker: str, function_name: str) -> Optional[str]:
     """Validate and normalize ticker input."""
     if not ticker or not isinstance(ticker, str):
-        logging.error(f"{function_name}: ticker must be a non-empty string")
+        logger.error(f"{function_name}: ticker must be a non-empty string")
         return None
     
     ticker = ticker.upper().strip()
     if not ticker:
-        logging.error(f"{function_name}: ticker cannot be empty")
+        logger.error(f"{function_name}: ticker cannot be empty")
         return None
         
     return ticker
@@ -133,19 +132,19 @@ def _validate_quarter_year(quarter: Optional[str], year: Optional[int], function
     """Validate quarter and year inputs."""
     if quarter:
         if not isinstance(quarter, str):
-            logging.error(f"{function_name}: quarter must be a string")
+            logger.error(f"{function_name}: quarter must be a string")
             return None, None
         quarter = quarter.upper().strip()
         if quarter not in ['Q1', 'Q2', 'Q3', 'Q4']:
-            logging.error(f"{function_name}: quarter must be Q1, Q2, Q3, or Q4")
+            logger.error(f"{function_name}: quarter must be Q1, Q2, Q3, or Q4")
             return None, None
     
     if year:
         if not isinstance(year, int):
-            logging.error(f"{function_name}: year must be an integer")
+            logger.error(f"{function_name}: year must be an integer")
             return None, None
         if year < 2000 or year > 2030:
-            logging.error(f"{function_name}: year must be between 2000 and 2030")
+            logger.error(f"{function_name}: year must be between 2000 and 2030")
             return None, None
     
     return quarter, year
@@ -185,78 +184,78 @@ def analyze_earnings_call(ticker: str, quarter: Optional[str] = None, year: Opti
         return None
     
     if not isinstance(model_name, str) or not model_name.strip():
-        logging.error("analyze_earnings_call: model_name must be a non-empty string")
+        logger.error("analyze_earnings_call: model_name must be a non-empty string")
         return None
     
     if custom_prompt is not None and not isinstance(custom_prompt, str):
-        logging.error("analyze_earnings_call: custom_prompt must be a string")
+        logger.error("analyze_earnings_call: custom_prompt must be a string")
         return None
     
     try:
-        logging.info(f"Starting complete analysis for {ticker}" + 
+        logger.info(f"Starting complete analysis for {ticker}" + 
                     (f" {quarter} {year}" if quarter and year else ""))
         
         # Step 1: Fetch transcript
-        logging.info(f"Step 1/4: Fetching transcript for {ticker}...")
+        logger.info(f"Step 1/4: Fetching transcript for {ticker}...")
         transcript = fetch_transcript(ticker, quarter, year)
         if not transcript:
-            logging.error(f"Failed to fetch transcript for {ticker}")
+            logger.error(f"Failed to fetch transcript for {ticker}")
             return None
         
         # Validate transcript
         if not validate_transcript_result(transcript):
-            logging.error(f"Invalid transcript result for {ticker}")
+            logger.error(f"Invalid transcript result for {ticker}")
             return None
             
-        logging.info(f"✓ Successfully fetched transcript ({len(transcript['transcript_text'])} characters)")
+        logger.info(f"✓ Successfully fetched transcript ({len(transcript['transcript_text'])} characters)")
             
         # Step 2: Analyze sentiment (with optional custom prompt)
-        logging.info(f"Step 2/4: Analyzing sentiment for {ticker}...")
+        logger.info(f"Step 2/4: Analyzing sentiment for {ticker}...")
         sentiment = score_sentiment(transcript['transcript_text'], model_name, custom_prompt)
         if not sentiment:
-            logging.error(f"Failed to analyze sentiment for {ticker}")
+            logger.error(f"Failed to analyze sentiment for {ticker}")
             return None
         
         # Validate sentiment (only for default prompts)
         if not custom_prompt and not validate_sentiment_result(sentiment):
-            logging.error(f"Invalid sentiment result for {ticker}")
+            logger.error(f"Invalid sentiment result for {ticker}")
             return None
             
-        logging.info(f"✓ Successfully analyzed sentiment" + 
+        logger.info(f"✓ Successfully analyzed sentiment" + 
                     (f" (score: {sentiment.get('overall_sentiment_score', 'N/A')})" if not custom_prompt else ""))
             
         # Step 3: Get company profile
-        logging.info(f"Step 3/4: Fetching company profile for {ticker}...")
+        logger.info(f"Step 3/4: Fetching company profile for {ticker}...")
         profile = fetch_company_profile(ticker)
         if not profile:
-            logging.error(f"Failed to fetch company profile for {ticker}")
+            logger.error(f"Failed to fetch company profile for {ticker}")
             return None
         
         # Validate profile
         if not validate_financial_data(profile, "profile"):
-            logging.error(f"Invalid company profile for {ticker}")
+            logger.error(f"Invalid company profile for {ticker}")
             return None
             
-        logging.info(f"✓ Successfully fetched profile for {profile.get('companyName', ticker)}")
+        logger.info(f"✓ Successfully fetched profile for {profile.get('companyName', ticker)}")
             
         # Step 4: Calculate stock performance (optional - may fail without affecting result)
         stock_performance = None
         call_date = transcript.get('call_date')
         
         if call_date:
-            logging.info(f"Step 4/4: Calculating stock performance for {ticker}...")
+            logger.info(f"Step 4/4: Calculating stock performance for {ticker}...")
             try:
                 stock_performance = calculate_stock_performance(ticker, call_date)
                 if stock_performance and validate_financial_data(stock_performance, "stock_performance"):
-                    logging.info(f"✓ Successfully calculated stock performance")
+                    logger.info(f"✓ Successfully calculated stock performance")
                 else:
-                    logging.warning(f"Could not calculate valid stock performance for {ticker}")
+                    logger.warning(f"Could not calculate valid stock performance for {ticker}")
                     stock_performance = None
             except Exception as e:
-                logging.warning(f"Error calculating stock performance for {ticker}: {e}")
+                logger.warning(f"Error calculating stock performance for {ticker}: {e}")
                 stock_performance = None
         else:
-            logging.warning(f"No call date available, skipping stock performance calculation")
+            logger.warning(f"No call date available, skipping stock performance calculation")
         
         result = {
             'transcript': transcript,
@@ -273,11 +272,11 @@ def analyze_earnings_call(ticker: str, quarter: Optional[str] = None, year: Opti
             }
         }
         
-        logging.info(f"✓ Complete analysis finished successfully for {ticker}")
+        logger.info(f"✓ Complete analysis finished successfully for {ticker}")
         return result
         
     except Exception as e:
-        logging.error(f"Unexpected error during complete analysis for {ticker}: {e}")
+        logger.error(f"Unexpected error during complete analysis for {ticker}: {e}")
         return None
 
 def quick_sentiment_analysis(ticker: str, quarter: Optional[str] = None, year: Optional[int] = None, 
@@ -310,44 +309,44 @@ def quick_sentiment_analysis(ticker: str, quarter: Optional[str] = None, year: O
         return None
     
     if not isinstance(model_name, str) or not model_name.strip():
-        logging.error("quick_sentiment_analysis: model_name must be a non-empty string")
+        logger.error("quick_sentiment_analysis: model_name must be a non-empty string")
         return None
     
     if custom_prompt is not None and not isinstance(custom_prompt, str):
-        logging.error("quick_sentiment_analysis: custom_prompt must be a string")
+        logger.error("quick_sentiment_analysis: custom_prompt must be a string")
         return None
     
     try:
-        logging.info(f"Starting quick sentiment analysis for {ticker}" + 
+        logger.info(f"Starting quick sentiment analysis for {ticker}" + 
                     (f" {quarter} {year}" if quarter and year else ""))
         
         # Step 1: Fetch transcript
-        logging.info(f"Step 1/2: Fetching transcript for {ticker}...")
+        logger.info(f"Step 1/2: Fetching transcript for {ticker}...")
         transcript = fetch_transcript(ticker, quarter, year)
         if not transcript:
-            logging.error(f"Failed to fetch transcript for {ticker}")
+            logger.error(f"Failed to fetch transcript for {ticker}")
             return None
         
         # Validate transcript
         if not validate_transcript_result(transcript):
-            logging.error(f"Invalid transcript result for {ticker}")
+            logger.error(f"Invalid transcript result for {ticker}")
             return None
             
-        logging.info(f"✓ Successfully fetched transcript ({len(transcript['transcript_text'])} characters)")
+        logger.info(f"✓ Successfully fetched transcript ({len(transcript['transcript_text'])} characters)")
             
         # Step 2: Analyze sentiment
-        logging.info(f"Step 2/2: Analyzing sentiment for {ticker}...")
+        logger.info(f"Step 2/2: Analyzing sentiment for {ticker}...")
         sentiment = score_sentiment(transcript['transcript_text'], model_name, custom_prompt)
         if not sentiment:
-            logging.error(f"Failed to analyze sentiment for {ticker}")
+            logger.error(f"Failed to analyze sentiment for {ticker}")
             return None
         
         # Validate sentiment (only for default prompts)
         if not custom_prompt and not validate_sentiment_result(sentiment):
-            logging.error(f"Invalid sentiment result for {ticker}")
+            logger.error(f"Invalid sentiment result for {ticker}")
             return None
             
-        logging.info(f"✓ Successfully analyzed sentiment" + 
+        logger.info(f"✓ Successfully analyzed sentiment" + 
                     (f" (score: {sentiment.get('overall_sentiment_score', 'N/A')})" if not custom_prompt else ""))
         
         result = {
@@ -363,11 +362,11 @@ def quick_sentiment_analysis(ticker: str, quarter: Optional[str] = None, year: O
             }
         }
         
-        logging.info(f"✓ Quick sentiment analysis finished successfully for {ticker}")
+        logger.info(f"✓ Quick sentiment analysis finished successfully for {ticker}")
         return result
         
     except Exception as e:
-        logging.error(f"Unexpected error during quick sentiment analysis for {ticker}: {e}")
+        logger.error(f"Unexpected error during quick sentiment analysis for {ticker}: {e}")
         return None
 
 def batch_analyze_earnings_calls(tickers: List[str], quarter: Optional[str] = None, year: Optional[int] = None,
@@ -386,7 +385,7 @@ def batch_analyze_earnings_calls(tickers: List[str], quarter: Optional[str] = No
         list: List of complete analysis results in same order as input tickers
     """
     if not tickers or not isinstance(tickers, list):
-        logging.error("batch_analyze_earnings_calls: tickers must be a non-empty list")
+        logger.error("batch_analyze_earnings_calls: tickers must be a non-empty list")
         return []
     
     # Validate quarter and year once
@@ -399,17 +398,17 @@ def batch_analyze_earnings_calls(tickers: List[str], quarter: Optional[str] = No
     results = []
     
     for i, ticker in enumerate(tickers):
-        logging.info(f"Processing ticker {i+1}/{len(tickers)}: {ticker}")
+        logger.info(f"Processing ticker {i+1}/{len(tickers)}: {ticker}")
         
         try:
             result = analyze_earnings_call(ticker, quarter, year, model_name, custom_prompt)
             results.append(result)
         except Exception as e:
-            logging.error(f"Error processing ticker {ticker}: {e}")
+            logger.error(f"Error processing ticker {ticker}: {e}")
             results.append(None)
     
     success_count = len([r for r in results if r is not None])
-    logging.info(f"Batch analysis complete: {success_count}/{len(tickers)} successful")
+    logger.info(f"Batch analysis complete: {success_count}/{len(tickers)} successful")
     
     return results
 
@@ -5,8 +5,7 @@ import logging
 from pathlib import Path
 import re
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
 
 # Determine the absolute path for the database file
 # Prioritize EARNINGS_ANALYZER_DB environment variable
@@ -19,14 +18,14 @@ else:
         app_data_dir.mkdir(parents=True, exist_ok=True)
         DATABASE_FILE = str(app_data_dir / "earnings_analyzer.db")
     except PermissionError as e:
-        logging.error(f"Permission denied creating database directory: {e}")
+        logger.error(f"Permission denied creating database directory: {e}")
         # Fallback to current directory
         DATABASE_FILE = "earnings_analyzer.db"
-        logging.warning(f"Using fallback database location: {DATABASE_FILE}")
+        logger.warning(f"Using fallback database location: {DATABASE_FILE}")
     except OSError as e:
-        logging.error(f"OS error creating database directory: {e}")
+        logger.error(f"OS error creating database directory: {e}")
         DATABASE_FILE = "earnings_analyzer.db"
-        logging.warning(f"Using fallback database location: {DATABASE_FILE}")
+        logger.warning(f"Using fallback database location: {DATABASE_FILE}")
 
 sql_create_companies_table = """
 CREATE TABLE IF NOT EXISTS companies (
@@ -106,24 +105,34 @@ def _validate_column_name(column_name):
         
     return True
 
-def create_connection(db_file):
-    """Create a database connection to the SQLite database specified by db_file."""
+def create_connection(db_file, check_same_thread=True):
+    """Create a database connection to the SQLite database specified by db_file.
+
+    Pass check_same_thread=False when the connection is shared across worker
+    threads; callers are then responsible for serializing access.
+    """
     conn = None
     try:
-        conn = sqlite3.connect(db_file, timeout=30.0)
+        conn = sqlite3.connect(db_file, timeout=30.0, check_same_thread=check_same_thread)
         # Enable foreign key constraints
         conn.execute("PRAGMA foreign_keys = ON")
+        # WAL lets readers proceed during writes and, with synchronous=NORMAL,
+        # avoids an fsync on every commit
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -64000")  # ~64 MB page cache
         return conn
     except Error as e:
-        logging.error(f"Error connecting to database {db_file}: {e}")
+        logger.error(f"Error connecting to database {db_file}: {e}")
     except Exception as e:
-        logging.error(f"Unexpected error connecting to database {db_file}: {e}")
+        logger.error(f"Unexpected error connecting to database {db_file}: {e}")
     return conn
 
 def create_table(conn, create_table_sql):
     """Create a table from the create_table_sql statement."""
     if not conn:
-        logging.error("No database connection provided")
+        logger.error("No database connection provided")
         return False
         
     try:
@@ -132,7 +141,7 @@ def create_table(conn, create_table_sql):
         conn.commit()
         return True
     except Error as e:
-        logging.error(f"Error creating table: {e}")
+        logger.error(f"Error creating table: {e}")
         return False
     finally:
         if c:
@@ -152,7 +161,7 @@ def setup_database():
             success &= create_table(conn, sql_create_stock_performance_table)
 
             if not success:
-                logging.error("Failed to create one or more database tables")
+                logger.error("Failed to create one or more database tables")
                 return False
 
             # Add new columns to sentiment_analysis table if they don't exist
@@ -170,14 +179,14 @@ def setup_database():
                     if column_name not in columns:
                         if _validate_column_name(column_name):
                             cursor.execute(f"ALTER TABLE sentiment_analysis ADD COLUMN {column_name} {column_type};")
-                            logging.info(f"Added '{column_name}' column to sentiment_analysis table.")
+                            logger.info(f"Added '{column_name}' column to sentiment_analysis table.")
                         else:
-                            logging.error(f"Invalid column name: {column_name}")
+                            logger.error(f"Invalid column name: {column_name}")
                 
                 conn.commit()
                 
             except Error as e:
-                logging.error(f"Error altering sentiment_analysis table: {e}")
+                logger.error(f"Error altering sentiment_analysis table: {e}")
                 return False
             finally:
                 if cursor:
@@ -186,18 +195,20 @@ def setup_database():
             return True
             
         except Exception as e:
-            logging.error(f"Unexpected error during database setup: {e}")
+            logger.error(f"Unexpected error during database setup: {e}")
             return False
         finally:
             conn.close()
     else:
-        logging.error("Error! Cannot create the database connection.")
+        logger.error("Error! Cannot create the database connection.")
         return False
 
-def insert_company(conn, company_data):
-    """Insert a new company into the companies table."""
+def insert_company(conn, company_data, commit=True):
+    """Insert a new company into the companies table.
+    Pass commit=False to leave the transaction open for the caller to commit or roll back.
+    """
     if not conn:
-        logging.error("No database connection provided")
+        logger.error("No database connection provided")
         return None
         
     sql = ''' INSERT OR IGNORE INTO companies(ticker, company_name, sector)
@@ -206,15 +217,18 @@ def insert_company(conn, company_data):
     try:
         cursor = conn.cursor()
         cursor.execute(sql, company_data)
-        conn.commit()
+        if commit:
+            conn.commit()
         return cursor.lastrowid
     except Error as e:
-        logging.error(f"Error inserting company data: {e}")
-        conn.rollback()
+        logger.error(f"Error inserting company data: {e}")
+        if commit:
+            conn.rollback()
         return None
     except Exception as e:
-        logging.error(f"Unexpected error inserting company data: {e}")
-        conn.rollback()
+        logger.error(f"Unexpected error inserting company data: {e}")
+        if commit:
+            conn.rollback()
         return None
     finally:
         if cursor:
@@ -223,7 +237,7 @@ def insert_company(conn, company_data):
 def select_company_by_ticker(conn, ticker):
     """Query companies by ticker."""
     if not conn:
-        logging.error("No database connection provided")
+        logger.error("No database connection provided")
         return None
         
     cursor = None
@@ -233,19 +247,21 @@ def select_company_by_ticker(conn, ticker):
         rows = cursor.fetchall()
         return rows
     except Error as e:
-        logging.error(f"Error selecting company by ticker {ticker}: {e}")
+        logger.error(f"Error selecting company by ticker {ticker}: {e}")
         return None
     except Exception as e:
-        logging.error(f"Unexpected error selecting company by ticker {ticker}: {e}")
+        logger.error(f"Unexpected error selecting company by ticker {ticker}: {e}")
         return None
     finally:
         if cursor:
             cursor.close()
 
-def insert_earnings_call(conn, earnings_call_data):
-    """Insert a new earnings call into the earnings_calls table."""
+def insert_earnings_call(conn, earnings_call_data, commit=True):
+    """Insert a new earnings call into the earnings_calls table.
+    Pass commit=False to leave the transaction open for the caller to commit or roll back.
+    """
     if not conn:
-        logging.error("No database connection provided")
+        logger.error("No database connection provided")
         return None
         
     sql = ''' INSERT OR IGNORE INTO earnings_calls(ticker, call_date, quarter, year, transcript_text, filing_url)
@@ -254,7 +270,8 @@ def insert_earnings_call(conn, earnings_call_data):
     try:
         cursor = conn.cursor()
         cursor.execute(sql, earnings_call_data)
-        conn.commit()
+        if commit:
+            conn.commit()
         
         # Check if we actually inserted (not ignored due to duplicate)
         if cursor.rowcount == 0:
@@ -264,28 +281,31 @@ def insert_earnings_call(conn, earnings_call_data):
                           (earnings_call_data[0], earnings_call_data[2], earnings_call_data[3]))
             existing_row = cursor.fetchone()
             if existing_row:
-                logging.info(f"Earnings call already exists for {earnings_call_data[0]} {earnings_call_data[2]} {earnings_call_data[3]}")
+                logger.info(f"Earnings call already exists for {earnings_call_data[0]} {earnings_call_data[2]} {earnings_call_data[3]}")
                 return existing_row[0]
         
         return cursor.lastrowid
     except Error as e:
-        logging.error(f"Error inserting earnings call data: {e}")
-        conn.rollback()
+        logger.error(f"Error inserting earnings call data: {e}")
+        if commit:
+            conn.rollback()
         return None
     except Exception as e:
-        logging.error(f"Unexpected error inserting earnings call data: {e}")
-        conn.rollback()
+        logger.error(f"Unexpected error inserting earnings call data: {e}")
+        if commit:
+            conn.rollback()
         return None
     finally:
         if cursor:
             cursor.close()
 
-def insert_sentiment_analysis(conn, sentiment_data):
+def insert_sentiment_analysis(conn, sentiment_data, commit=True):
     """Insert a new sentiment analysis result.
     sentiment_data should be a tuple: (earnings_call_id, overall_sentiment_score, confidence_level, key_themes, model_name, qualitative_assessment)
+    Pass commit=False to leave the transaction open for the caller to commit or roll back.
     """
     if not conn:
-        logging.error("No database connection provided")
+        logger.error("No database connection provided")
         return None
         
     sql = ''' INSERT INTO sentiment_analysis(earnings_call_id, overall_sentiment_score, confidence_level, key_themes, model_name, qualitative_assessment)
@@ -294,24 +314,29 @@ def insert_sentiment_analysis(conn, sentiment_data):
     try:
         cursor = conn.cursor()
         cursor.execute(sql, sentiment_data)
-        conn.commit()
+        if commit:
+            conn.commit()
         return cursor.lastrowid
     except Error as e:
-        logging.error(f"Error inserting sentiment analysis data: {e}")
-        conn.rollback()
+        logger.error(f"Error inserting sentiment analysis data: {e}")
+        if commit:
+            conn.rollback()
         return None
     except Exception as e:
-        logging.error(f"Unexpected error inserting sentiment analysis data: {e}")
-        conn.rollback()
+        logger.error(f"Unexpected error inserting sentiment analysis data: {e}")
+        if commit:
+            conn.rollback()
         return None
     finally:
         if cursor:
             cursor.close()
 
-def insert_stock_performance(conn, stock_performance_data):
-    """Insert a new stock performance record."""
+def insert_stock_performance(conn, stock_performance_data, commit=True):
+    """Insert a new stock performance record.
+    Pass commit=False to leave the transaction open for the caller to commit or roll back.
+    """
     if not conn:
-        logging.error("No database connection provided")
+        logger.error("No database connection provided")
         return None
         
     sql = ''' INSERT INTO stock_performance(earnings_call_id, price_at_call, price_1_week, price_1_month, price_3_month, performance_1_week, performance_1_month, performance_3_month)
@@ -320,15 +345,18 @@ def insert_stock_performance(conn, stock_performance_data):
     try:
         cursor = conn.cursor()
         cursor.execute(sql, stock_performance_data)
-        conn.commit()
+        if commit:
+            conn.commit()
         return cursor.lastrowid
     except Error as e:
-        logging.error(f"Error inserting stock performance data: {e}")
-        conn.rollback()
+        logger.error(f"Error inserting stock performance data: {e}")
+        if commit:
+            conn.rollback()
         return None
     except Exception as e:
-        logging.error(f"Unexpected error inserting stock performance data: {e}")
-        conn.rollback()
+        logger.error(f"Unexpected error inserting stock performance data: {e}")
+        if commit:
+            conn.rollback()
         return None
     finally:
         if cursor:
@@ -337,7 +365,7 @@ def insert_stock_performance(conn, stock_performance_data):
 def select_earnings_calls_by_ticker(conn, ticker):
     """Query earnings calls by ticker, returning call_date, quarter, year, and transcript_text."""
     if not conn:
-        logging.error("No database connection provided")
+        logger.error("No database connection provided")
         return None
         
     cursor = None
@@ -366,10 +394,10 @@ def select_earnings_calls_by_ticker(conn, ticker):
         rows = cursor.fetchall()
         return rows
     except Error as e:
-        logging.error(f"Error selecting earnings calls by ticker {ticker}: {e}")
+        logger.error(f"Error selecting earnings calls by ticker {ticker}: {e}")
         return None
     except Exception as e:
-        logging.error(f"Unexpected error selecting earnings calls by ticker {ticker}: {e}")
+        logger.error(f"Unexpected error selecting earnings calls by ticker {ticker}: {e}")
         return None
     finally:
         if cursor:
@@ -378,7 +406,7 @@ def select_earnings_calls_by_ticker(conn, ticker):
 def select_earnings_call_by_ticker_quarter_year(conn, ticker, quarter, year):
     """Query a specific earnings call by ticker, quarter, and year, joining all related tables."""
     if not conn:
-        logging.error("No database connection provided")
+        logger.error("No database connection provided")
         return None
         
     cursor = None
@@ -399,10 +427,10 @@ def select_earnings_call_by_ticker_quarter_year(conn, ticker, quarter, year):
         row = cursor.fetchone()
         return row
     except Error as e:
-        logging.error(f"Error selecting earnings call by ticker, quarter, and year for {ticker}: {e}")
+        logger.error(f"Error selecting earnings call by ticker, quarter, and year for {ticker}: {e}")
         return None
     except Exception as e:
-        logging.error(f"Unexpected error selecting earnings call by ticker, quarter, and year for {ticker}: {e}")
+        logger.error(f"Unexpected error selecting earnings call by ticker, quarter, and year for {ticker}: {e}")
         return None
     finally:
         if cursor:
@@ -411,7 +439,7 @@ def select_earnings_call_by_ticker_quarter_year(conn, ticker, quarter, year):
 def select_all_earnings_calls(conn):
     """Query all earnings calls from the earnings_calls table, including transcript_text."""
     if not conn:
-        logging.error("No database connection provided")
+        logger.error("No database connection provided")
         return None
         
     cursor = None
@@ -438,10 +466,10 @@ def select_all_earnings_calls(conn):
         rows = cursor.fetchall()
         return rows
     except Error as e:
-        logging.error(f"Error selecting all earnings calls: {e}")
+        logger.error(f"Error selecting all earnings calls: {e}")
         return None
     except Exception as e:
-        logging.error(f"Unexpected error selecting all earnings calls: {e}")
+        logger.error(f"Unexpected error selecting all earnings calls: {e}")
         return None
     finally:
         if cursor:
@@ -452,14 +480,14 @@ def close_connection(conn):
     if conn:
         try:
             conn.close()
-            logging.debug("Database connection closed successfully")
+            logger.debug("Database connection closed successfully")
         except Exception as e:
-            logging.error(f"Error closing database connection: {e}")
+            logger.error(f"Error closing database connection: {e}")
 
 def get_database_stats(conn):
     """Get basic statistics about the database contents."""
     if not conn:
-        logging.error("No database connection provided")
+        logger.error("No database connection provided")
         return None
         
     cursor = None
@@ -490,10 +518,10 @@ def get_database_stats(conn):
         }
         
     except Error as e:
-        logging.error(f"Error getting database statistics: {e}")
+        logger.error(f"Error getting database statistics: {e}")
         return None
     except Exception as e:
-        logging.error(f"Unexpected error getting database statistics: {e}")
+        logger.error(f"Unexpected error getting database statistics: {e}")
         return None
     finally:
         if cursor:
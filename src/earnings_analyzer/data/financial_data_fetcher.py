@@ -1,13 +1,15 @@
 import requests
 import logging
+import numpy as np
 import pandas as pd
 import datetime
 from urllib.parse import urlparse, parse_qs
 import time
 from earnings_analyzer.config import get_fmp_api_key
+from earnings_analyzer.utils.cache import response_cache
+from earnings_analyzer.utils.http import create_session
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
 
 BASE_URL = "https://financialmodelingprep.com/api/v3"
 
@@ -15,6 +17,14 @@ BASE_URL = "https://financialmodelingprep.com/api/v3"
 _api_key_validated = None
 _last_rate_limit_time = {}
 
+# Shared session so repeated FMP calls reuse pooled connections
+_session = create_session()
+
+# Price history calculate_stock_performance needs around a call: enough days before it
+# to find the last close on or before the call date, and past the 90-day lookup after it
+PRICE_WINDOW_DAYS_BEFORE = 7
+PRICE_WINDOW_DAYS_AFTER = 100
+
 def _check_fmp_api_key():
     """Internal helper to check if FMP API key is configured."""
     global _api_key_validated
@@ -22,7 +32,7 @@ def _check_fmp_api_key():
     if _api_key_validated is None:
         api_key = get_fmp_api_key()
         if not api_key:
-            logging.error("FMP_API_KEY is not set in the environment variables. Please set it to use Financial Modeling Prep API.")
+            logger.error("FMP_API_KEY is not set in the environment variables. Please set it to use Financial Modeling Prep API.")
             _api_key_validated = False
         else:
             _api_key_validated = True
@@ -60,7 +70,7 @@ def _handle_rate_limiting(response, ticker=None):
                 wait_time = 30
             _last_rate_limit_time[key] = current_time
             
-        logging.warning(f"Rate limited. Waiting {wait_time} seconds before retry...")
+        logger.warning(f"Rate limited. Waiting {wait_time} seconds before retry...")
         time.sleep(wait_time)
         return True
     return False
@@ -72,7 +82,7 @@ def _make_api_request(url, timeout=30, max_retries=3, ticker=None):
         
     for attempt in range(max_retries):
         try:
-            response = requests.get(url, timeout=timeout)
+            response = _session.get(url, timeout=timeout)
             
             # Handle rate limiting
             if _handle_rate_limiting(response, ticker):
@@ -82,47 +92,47 @@ def _make_api_request(url, timeout=30, max_retries=3, ticker=None):
             data = response.json()
             
             if not data:
-                logging.warning(f"Empty response from FMP API for {_sanitize_url_for_logging(url)}")
+                logger.warning(f"Empty response from FMP API for {_sanitize_url_for_logging(url)}")
                 return None
                 
             return data
             
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 403:
-                logging.error(f"API key invalid or quota exceeded (HTTP 403). Check your FMP API key and subscription limits.")
+                logger.error(f"API key invalid or quota exceeded (HTTP 403). Check your FMP API key and subscription limits.")
                 return None
             elif e.response.status_code == 404:
-                logging.warning(f"Resource not found (HTTP 404) for {ticker or 'request'}")
+                logger.warning(f"Resource not found (HTTP 404) for {ticker or 'request'}")
                 return None
             else:
-                logging.error(f"HTTP Error {e.response.status_code} from FMP API: {e}")
+                logger.error(f"HTTP Error {e.response.status_code} from FMP API: {e}")
                 if attempt == max_retries - 1:
                     return None
                     
         except requests.exceptions.Timeout:
-            logging.warning(f"Request timeout (attempt {attempt + 1}/{max_retries}) for {ticker or 'request'}")
+            logger.warning(f"Request timeout (attempt {attempt + 1}/{max_retries}) for {ticker or 'request'}")
             if attempt == max_retries - 1:
-                logging.error(f"Final timeout after {max_retries} attempts")
+                logger.error(f"Final timeout after {max_retries} attempts")
                 return None
                 
         except requests.exceptions.ConnectionError as e:
-            logging.warning(f"Connection error (attempt {attempt + 1}/{max_retries}): {e}")
+            logger.warning(f"Connection error (attempt {attempt + 1}/{max_retries}): {e}")
             if attempt == max_retries - 1:
-                logging.error(f"Final connection error after {max_retries} attempts")
+                logger.error(f"Final connection error after {max_retries} attempts")
                 return None
                 
         except requests.exceptions.RequestException as e:
-            logging.error(f"Request error from FMP API: {e}")
+            logger.error(f"Request error from FMP API: {e}")
             return None
             
         except ValueError as e:  # JSON decode error
-            logging.error(f"Invalid JSON response from FMP API: {e}")
+            logger.error(f"Invalid JSON response from FMP API: {e}")
             return None
             
         # Wait before retry (except for last attempt)
         if attempt < max_retries - 1:
             wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
-            logging.info(f"Retrying in {wait_time} seconds...")
+            logger.info(f"Retrying in {wait_time} seconds...")
             time.sleep(wait_time)
             
     return None
@@ -141,11 +151,12 @@ def fetch_company_profile(ticker):
         None: If profile could not be fetched
     """
     if not ticker or not isinstance(ticker, str):
-        logging.error("Invalid ticker provided to fetch_company_profile")
+        logger.error("Invalid ticker provided to fetch_company_profile")
         return None
         
     return get_company_profile(ticker.upper().strip())
 
+@response_cache.cached(endpoint="fmp_profile", ttl_days=30)
 def get_company_profile(ticker):
     """
     Fetches the company profile for a given ticker from the FMP API.
@@ -162,7 +173,7 @@ def get_company_profile(ticker):
         None: If profile could not be fetched
     """
     if not ticker or not isinstance(ticker, str):
-        logging.error("Invalid ticker provided to get_company_profile")
+        logger.error("Invalid ticker provided to get_company_profile")
         return None
         
     ticker = ticker.upper().strip()
@@ -176,22 +187,28 @@ def get_company_profile(ticker):
         profile = data[0]
         # Validate essential fields
         if not profile.get('symbol') or not profile.get('companyName'):
-            logging.warning(f"Incomplete profile data for {ticker}")
+            logger.warning(f"Incomplete profile data for {ticker}")
             return None
             
-        logging.info(f"Successfully fetched profile for {ticker}: {profile.get('companyName', 'N/A')}")
+        logger.info(f"Successfully fetched profile for {ticker}: {profile.get('companyName', 'N/A')}")
         return profile
     else:
-        logging.warning(f"No profile data found for {ticker}.")
+        logger.warning(f"No profile data found for {ticker}.")
         return None
 
-def get_historical_prices(ticker, limit=None):
+@response_cache.cached(endpoint="fmp_historical_prices", ttl_days=1)
+def get_historical_prices(ticker, limit=None, from_date=None, to_date=None):
     """
     Fetches historical daily stock prices for a given ticker from the FMP API.
     
+    Without from_date/to_date FMP returns the full daily history, which is
+    several years of records; pass a date range when only part of it is needed.
+    
     Args:
         ticker (str): Stock ticker symbol
         limit (int, optional): Maximum number of historical records to return
+        from_date (str or datetime, optional): Earliest date to include
+        to_date (str or datetime, optional): Latest date to include
         
     Returns:
         list: List of daily price records with keys:
@@ -199,7 +216,7 @@ def get_historical_prices(ticker, limit=None):
         None: If historical prices could not be fetched
     """
     if not ticker or not isinstance(ticker, str):
-        logging.error("Invalid ticker provided to get_historical_prices")
+        logger.error("Invalid ticker provided to get_historical_prices")
         return None
         
     ticker = ticker.upper().strip()
@@ -207,6 +224,14 @@ def get_historical_prices(ticker, limit=None):
     if limit and isinstance(limit, int) and limit > 0:
         url += f"&limit={limit}"
     
+    for param, value in (("from", from_date), ("to", to_date)):
+        if value is None:
+            continue
+        date_value = _validate_date_input(value, f"{param}_date")
+        if not date_value:
+            return None
+        url += f"&{param}={date_value.isoformat()}"
+    
     data = _make_api_request(url, ticker=ticker)
     if not data:
         return None
@@ -217,19 +242,19 @@ def get_historical_prices(ticker, limit=None):
         # Validate data structure
         required_fields = ['date', 'close', 'open', 'high', 'low']
         if historical_data and all(field in historical_data[0] for field in required_fields):
-            logging.info(f"Successfully fetched {len(historical_data)} historical price records for {ticker}")
+            logger.info(f"Successfully fetched {len(historical_data)} historical price records for {ticker}")
             return historical_data
         else:
-            logging.warning(f"Historical price data missing required fields for {ticker}")
+            logger.warning(f"Historical price data missing required fields for {ticker}")
             return None
     else:
-        logging.warning(f"No historical price data found for {ticker}.")
+        logger.warning(f"No historical price data found for {ticker}.")
         return None
 
 def _validate_date_input(date_input, param_name="date"):
     """Validate and convert date input to datetime.date object."""
     if not date_input:
-        logging.warning(f"{param_name} is required")
+        logger.warning(f"{param_name} is required")
         return None
         
     try:
@@ -248,9 +273,53 @@ def _validate_date_input(date_input, param_name="date"):
         else:
             raise ValueError(f"Unsupported date type: {type(date_input)}")
     except Exception as e:
-        logging.error(f"Error validating {param_name}: {e}")
+        logger.error(f"Error validating {param_name}: {e}")
         return None
 
+def get_price_window(call_date):
+    """
+    Returns the date range of prices needed to calculate performance around a call.
+    
+    Args:
+        call_date (str or datetime): Date of the earnings call
+        
+    Returns:
+        tuple: (from_date, to_date) as datetime.date objects
+        None: If call_date is invalid
+    """
+    call_date = _validate_date_input(call_date, "call_date")
+    if not call_date:
+        return None
+    return (call_date - datetime.timedelta(days=PRICE_WINDOW_DAYS_BEFORE),
+            call_date + datetime.timedelta(days=PRICE_WINDOW_DAYS_AFTER))
+
+def _build_price_arrays(historical_prices):
+    """
+    Convert price records into date-sorted NumPy arrays.
+    
+    Records with a missing or unparseable date or close are skipped.
+    
+    Returns:
+        tuple: (dates as datetime64[D] array, closes as float64 array)
+    """
+    dates = []
+    closes = []
+    for record in historical_prices:
+        try:
+            date = np.datetime64(str(record['date'])[:10], 'D')
+            close = float(record['close'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if np.isnat(date) or np.isnan(close):
+            continue
+        dates.append(date)
+        closes.append(close)
+    
+    dates = np.array(dates, dtype='datetime64[D]')
+    closes = np.array(closes, dtype=np.float64)
+    order = np.argsort(dates, kind='stable')
+    return dates[order], closes[order]
+
 def calculate_stock_performance(ticker, call_date, historical_prices=None):
     """
     Calculates stock performance metrics relative to earnings call date.
@@ -269,7 +338,7 @@ def calculate_stock_performance(ticker, call_date, historical_prices=None):
         None: If calculation failed
     """
     if not ticker or not isinstance(ticker, str):
-        logging.error("Invalid ticker provided to calculate_stock_performance")
+        logger.error("Invalid ticker provided to calculate_stock_performance")
         return None
         
     call_date = _validate_date_input(call_date, "call_date")
@@ -279,50 +348,41 @@ def calculate_stock_performance(ticker, call_date, historical_prices=None):
     ticker = ticker.upper().strip()
         
     try:
-        # Fetch historical prices if not provided
+        # Fetch only the window around the call if prices were not provided
         if historical_prices is None:
-            historical_prices = get_historical_prices(ticker)
+            from_date, to_date = get_price_window(call_date)
+            historical_prices = get_historical_prices(ticker, from_date=from_date, to_date=to_date)
             
         if not historical_prices:
-            logging.warning(f"No historical prices available for {ticker}")
+            logger.warning(f"No historical prices available for {ticker}")
             return None
 
-        df = pd.DataFrame(historical_prices)
+        # Sorted arrays let each lookup be a binary search instead of a boolean mask scan
+        dates, closes = _build_price_arrays(historical_prices)
         
-        # Validate DataFrame structure
-        required_columns = ['date', 'close']
-        if not all(col in df.columns for col in required_columns):
-            logging.error(f"Historical price data missing required columns for {ticker}")
+        if len(dates) == 0:
+            logger.warning(f"No valid price data after cleaning for {ticker}")
             return None
-            
-        df['date'] = pd.to_datetime(df['date'], errors='coerce')
-        df = df.dropna(subset=['date', 'close'])
-        
-        if df.empty:
-            logging.warning(f"No valid price data after cleaning for {ticker}")
-            return None
-            
-        df = df.set_index('date').sort_index()
 
-        call_date_dt = pd.to_datetime(call_date)
+        call_date_dt = np.datetime64(call_date, 'D')
 
         # Find the price at call date (or closest prior date)
-        price_at_call_series = df.loc[df.index <= call_date_dt, 'close']
-        if price_at_call_series.empty:
-            logging.warning(f"No price data available at or before call date {call_date} for {ticker}")
+        call_idx = np.searchsorted(dates, call_date_dt, side='right') - 1
+        if call_idx < 0:
+            logger.warning(f"No price data available at or before call date {call_date} for {ticker}")
             return None
-        price_at_call = float(price_at_call_series.iloc[-1])
+        price_at_call = float(closes[call_idx])
 
         # Calculate future dates
-        one_week_later = call_date_dt + pd.Timedelta(weeks=1)
-        one_month_later = call_date_dt + pd.Timedelta(days=30)
-        three_month_later = call_date_dt + pd.Timedelta(days=90)
+        one_week_later = call_date_dt + np.timedelta64(7, 'D')
+        one_month_later = call_date_dt + np.timedelta64(30, 'D')
+        three_month_later = call_date_dt + np.timedelta64(90, 'D')
 
         # Get prices at future dates (or closest available)
         def get_next_available_price(target_date):
-            future_prices = df.loc[df.index >= target_date, 'close']
-            if not future_prices.empty:
-                return float(future_prices.iloc[0])
+            idx = np.searchsorted(dates, target_date, side='left')
+            if idx < len(dates):
+                return float(closes[idx])
             return None
 
         price_1_week = get_next_available_price(one_week_later)
@@ -339,7 +399,7 @@ def calculate_stock_performance(ticker, call_date, historical_prices=None):
         performance_1_month = safe_performance_calc(price_1_month, price_at_call)
         performance_3_month = safe_performance_calc(price_3_month, price_at_call)
 
-        logging.info(f"Calculated stock performance for {ticker} from {call_date}")
+        logger.info(f"Calculated stock performance for {ticker} from {call_date}")
         return {
             'price_at_call': price_at_call,
             'price_1_week': price_1_week,
@@ -351,7 +411,7 @@ def calculate_stock_performance(ticker, call_date, historical_prices=None):
         }
         
     except Exception as e:
-        logging.error(f"Error calculating stock performance for {ticker}: {e}")
+        logger.error(f"Error calculating stock performance for {ticker}: {e}")
         return None
 
 def get_financial_statements(ticker, period="quarter", limit=1):
@@ -368,15 +428,15 @@ def get_financial_statements(ticker, period="quarter", limit=1):
         None: If financial statements could not be fetched
     """
     if not ticker or not isinstance(ticker, str):
-        logging.error("Invalid ticker provided to get_financial_statements")
+        logger.error("Invalid ticker provided to get_financial_statements")
         return None
         
     if period not in ["quarter", "annual"]:
-        logging.error(f"Invalid period '{period}'. Must be 'quarter' or 'annual'")
+        logger.error(f"Invalid period '{period}'. Must be 'quarter' or 'annual'")
         return None
         
     if not isinstance(limit, int) or limit < 1:
-        logging.error(f"Invalid limit '{limit}'. Must be positive integer")
+        logger.error(f"Invalid limit '{limit}'. Must be positive integer")
         return None
         
     ticker = ticker.upper().strip()
@@ -397,10 +457,10 @@ def get_financial_statements(ticker, period="quarter", limit=1):
             "income_statement": income_statement[0] if limit == 1 and income_statement else income_statement,
             "balance_sheet": balance_sheet[0] if limit == 1 and balance_sheet else balance_sheet
         }
-        logging.info(f"Successfully fetched financial statements for {ticker}.")
+        logger.info(f"Successfully fetched financial statements for {ticker}.")
         return result
     else:
-        logging.warning(f"Incomplete financial statements found for {ticker}.")
+        logger.warning(f"Incomplete financial statements found for {ticker}.")
         return None
 
 def get_stock_quote(ticker):
@@ -415,7 +475,7 @@ def get_stock_quote(ticker):
         None: If quote could not be fetched
     """
     if not ticker or not isinstance(ticker, str):
-        logging.error("Invalid ticker provided to get_stock_quote")
+        logger.error("Invalid ticker provided to get_stock_quote")
         return None
         
     ticker = ticker.upper().strip()
@@ -429,13 +489,13 @@ def get_stock_quote(ticker):
         quote = data[0]
         # Validate essential fields
         if 'symbol' not in quote or 'price' not in quote:
-            logging.warning(f"Incomplete quote data for {ticker}")
+            logger.warning(f"Incomplete quote data for {ticker}")
             return None
             
-        logging.info(f"Successfully fetched quote for {ticker}: ${quote.get('price', 'N/A')}")
+        logger.info(f"Successfully fetched quote for {ticker}: ${quote.get('price', 'N/A')}")
         return quote
     else:
-        logging.warning(f"No quote data found for {ticker}.")
+        logger.warning(f"No quote data found for {ticker}.")
         return None
 
 def batch_fetch_company_profiles(tickers):
@@ -450,18 +510,18 @@ def batch_fetch_company_profiles(tickers):
               Failed fetches will be None in the corresponding position.
     """
     if not tickers or not isinstance(tickers, list):
-        logging.error("Invalid tickers list provided to batch_fetch_company_profiles")
+        logger.error("Invalid tickers list provided to batch_fetch_company_profiles")
         return []
         
     results = []
     
     for i, ticker in enumerate(tickers):
         if not ticker or not isinstance(ticker, str):
-            logging.warning(f"Skipping invalid ticker at position {i}: {ticker}")
+            logger.warning(f"Skipping invalid ticker at position {i}: {ticker}")
             results.append(None)
             continue
             
-        logging.info(f"Fetching profile {i+1}/{len(tickers)}: {ticker}")
+        logger.info(f"Fetching profile {i+1}/{len(tickers)}: {ticker}")
         result = get_company_profile(ticker)
         results.append(result)
         
@@ -471,31 +531,33 @@ def batch_fetch_company_profiles(tickers):
         
     return results
 
-def batch_fetch_historical_prices(tickers, limit=None):
+def batch_fetch_historical_prices(tickers, limit=None, from_date=None, to_date=None):
     """
     Fetches historical prices for multiple tickers in batch.
     
     Args:
         tickers (list): List of stock ticker symbols
         limit (int, optional): Maximum number of historical records per ticker
+        from_date (str or datetime, optional): Earliest date to include
+        to_date (str or datetime, optional): Latest date to include
         
     Returns:
         dict: Dictionary mapping ticker -> historical price data
     """
     if not tickers or not isinstance(tickers, list):
-        logging.error("Invalid tickers list provided to batch_fetch_historical_prices")
+        logger.error("Invalid tickers list provided to batch_fetch_historical_prices")
         return {}
         
     results = {}
     
     for i, ticker in enumerate(tickers):
         if not ticker or not isinstance(ticker, str):
-            logging.warning(f"Skipping invalid ticker at position {i}: {ticker}")
+            logger.warning(f"Skipping invalid ticker at position {i}: {ticker}")
             results[ticker] = None
             continue
             
-        logging.info(f"Fetching historical prices {i+1}/{len(tickers)}: {ticker}")
-        historical_data = get_historical_prices(ticker, limit)
+        logger.info(f"Fetching historical prices {i+1}/{len(tickers)}: {ticker}")
+        historical_data = get_historical_prices(ticker, limit, from_date=from_date, to_date=to_date)
         results[ticker] = historical_data
         
         # Small delay to be respectful to API
@@ -529,13 +591,13 @@ def get_market_summary():
         
         # Verify we got at least some data
         if any(market_data.values()):
-            logging.info("Successfully fetched market summary")
+            logger.info("Successfully fetched market summary")
             return market_data
         else:
-            logging.warning("No market data found in response")
+            logger.warning("No market data found in response")
             return None
     else:
-        logging.warning("No market summary data found.")
+        logger.warning("No market summary data found.")
         return None
 
 def get_earnings_calendar(ticker=None):
@@ -551,7 +613,7 @@ def get_earnings_calendar(ticker=None):
     """
     if ticker:
         if not isinstance(ticker, str):
-            logging.error("Invalid ticker provided to get_earnings_calendar")
+            logger.error("Invalid ticker provided to get_earnings_calendar")
             return None
         ticker = ticker.upper().strip()
         url = f"{BASE_URL}/historical/earning_calendar/{ticker}?apikey={get_fmp_api_key()}"
@@ -560,10 +622,10 @@ def get_earnings_calendar(ticker=None):
     
     data = _make_api_request(url, ticker=ticker)
     if data:
-        logging.info(f"Successfully fetched earnings calendar{' for ' + ticker if ticker else ''}")
+        logger.info(f"Successfully fetched earnings calendar{' for ' + ticker if ticker else ''}")
         return data
     else:
-        logging.warning(f"No earnings calendar data found{' for ' + ticker if ticker else ''}.")
+        logger.warning(f"No earnings calendar data found{' for ' + ticker if ticker else ''}.")
         return None
 
 def validate_financial_data(data, data_type):
@@ -605,7 +667,7 @@ def validate_financial_data(data, data_type):
             return isinstance(data, dict) and all(field in data for field in required_fields)
             
     except Exception as e:
-        logging.error(f"Error validating {data_type} data: {e}")
+        logger.error(f"Error validating {data_type} data: {e}")
         return False
         
     return False
@@ -624,7 +686,7 @@ def get_price_at_date(ticker, target_date, historical_prices=None):
         None: If price could not be found
     """
     if not ticker or not isinstance(ticker, str):
-        logging.error("Invalid ticker provided to get_price_at_date")
+        logger.error("Invalid ticker provided to get_price_at_date")
         return None
         
     target_date = _validate_date_input(target_date, "target_date")
@@ -645,14 +707,14 @@ def get_price_at_date(ticker, target_date, historical_prices=None):
         
         # Validate DataFrame structure
         if 'date' not in df.columns or 'close' not in df.columns:
-            logging.error(f"Historical price data missing required columns for {ticker}")
+            logger.error(f"Historical price data missing required columns for {ticker}")
             return None
             
         df['date'] = pd.to_datetime(df['date'], errors='coerce')
         df = df.dropna(subset=['date', 'close'])
         
         if df.empty:
-            logging.warning(f"No valid price data for {ticker}")
+            logger.warning(f"No valid price data for {ticker}")
             return None
             
         df['date'] = df['date'].dt.date
@@ -690,7 +752,7 @@ def get_price_at_date(ticker, target_date, historical_prices=None):
         return None
         
     except Exception as e:
-        logging.error(f"Error getting price at date for {ticker}: {e}")
+        logger.error(f"Error getting price at date for {ticker}: {e}")
         return None
 
 def compare_performance_to_market(ticker, call_date, historical_prices=None):
@@ -707,7 +769,7 @@ def compare_performance_to_market(ticker, call_date, historical_prices=None):
         None: If comparison could not be performed
     """
     if not ticker or not isinstance(ticker, str):
-        logging.error("Invalid ticker provided to compare_performance_to_market")
+        logger.error("Invalid ticker provided to compare_performance_to_market")
         return None
         
     call_date = _validate_date_input(call_date, "call_date")
@@ -725,7 +787,7 @@ def compare_performance_to_market(ticker, call_date, historical_prices=None):
         # Get S&P 500 performance for comparison
         sp500_perf = calculate_stock_performance("^GSPC", call_date)
         if not sp500_perf:
-            logging.warning("Could not fetch S&P 500 data for comparison")
+            logger.warning("Could not fetch S&P 500 data for comparison")
             return {
                 'stock_performance': stock_perf,
                 'relative_to_sp500': None
@@ -757,5 +819,5 @@ def compare_performance_to_market(ticker, call_date, historical_prices=None):
         }
         
     except Exception as e:
-        logging.error(f"Error comparing performance to market for {ticker}: {e}")
+        logger.error(f"Error comparing performance to market for {ticker}: {e}")
         return None
\ No newline at end of file
@@ -1,4 +1,5 @@
 import argparse
+import logging
 import os
 from dotenv import load_dotenv
 from earnings_analyzer.analyzer import EarningsAnalyzer
@@ -14,6 +15,8 @@ def main():
     This function handles command-line argument parsing and orchestrates
     the analysis using either the composable API or EarningsAnalyzer class.
     """
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+
     parser = argparse.ArgumentParser(
         description="A tool to fetch, scrape, and analyze earnings call transcripts."
     )
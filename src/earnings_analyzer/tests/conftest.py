@@ -0,0 +1,15 @@
+import pytest
+
+from earnings_analyzer.utils.cache import response_cache
+
+
+@pytest.fixture(autouse=True)
+def disable_response_cache():
+    """
+    Keep tests isolated from the on-disk response cache so mocked network
+    calls are never short-circuited by entries from earlier runs.
+    """
+    previous = response_cache.enabled
+    response_cache.enabled = False
+    yield
+    response_cache.enabled = previous
@@ -1,3 +1,5 @@
+import time
+
 import pytest
 from earnings_analyzer.analyzer import EarningsAnalyzer
 from earnings_analyzer.analysis import fool_scraper, sentiment_analyzer
@@ -182,4 +184,72 @@ def test_analyze_to_dataframe_specific_quarter_output(analyzer, mocker):
     assert all(col in df.columns for col in expected_columns)
     assert df['Ticker'].iloc[0] == 'TEST'
     assert df['Quarter'].iloc[0] == 'Q1'  # Should use provided quarter
-    assert df['Call Date'].iloc[0] == '2023-01-01'  # Should use constructed date from quarter/year
\ No newline at end of file
+    assert df['Call Date'].iloc[0] == '2023-01-01'  # Should use constructed date from quarter/year
+
+def test_analyze_to_dataframe_batch_resumes_from_checkpoint(analyzer, mocker, tmp_path):
+    """
+    Tests that analyze_to_dataframe_batch skips tickers already in the JSONL checkpoint,
+    analyzes repeated tickers once, and returns one row per ticker in input order.
+    """
+    checkpoint = tmp_path / "rows.jsonl"
+    # FMP reports BRK.B as BRK-B; the checkpoint must still be keyed on the requested ticker
+    checkpoint.write_text('{"Ticker": "AAA", "Overall Sentiment Score": 5, "_input_ticker": "AAA"}\n')
+
+    def fake_analyze(ticker, *args, **kwargs):
+        return {
+            'profile': {'symbol': ticker.replace('.', '-'), 'companyName': f'{ticker} Co'},
+            'sentiment': {'overall_sentiment_score': 7, 'confidence_level': 0.8, 'key_themes': ['growth']},
+            'stock_performance': None,
+            'call_date': '2023-01-25',
+            'quarter': 'Q1',
+        }
+    mock_analyze = mocker.patch.object(analyzer, 'analyze', side_effect=fake_analyze)
+
+    df = analyzer.analyze_to_dataframe_batch(['aaa', 'BRK.B', 'brk.b'], max_workers=2, output_jsonl=str(checkpoint))
+
+    mock_analyze.assert_called_once()
+    assert list(df['Ticker']) == ['AAA', 'BRK-B']
+    assert list(df['Overall Sentiment Score']) == [5, 7]
+    assert '_input_ticker' not in df.columns
+    assert len(checkpoint.read_text().splitlines()) == 2
+
+    # A rerun finds both tickers in the checkpoint and analyzes nothing
+    mock_analyze.reset_mock()
+    df = analyzer.analyze_to_dataframe_batch(['AAA', 'BRK.B'], output_jsonl=str(checkpoint))
+
+    mock_analyze.assert_not_called()
+    assert list(df['Ticker']) == ['AAA', 'BRK-B']
+    assert len(checkpoint.read_text().splitlines()) == 2
+
+def test_batch_analyze_concurrent_keeps_input_order(analyzer, mocker):
+    """
+    Tests that batch_analyze with several workers returns results in input order
+    even when later tickers finish first.
+    """
+    delays = {'AAA': 0.3, 'BBB': 0.0, 'CCC': 0.15}
+
+    def fake_analyze(ticker, *args, **kwargs):
+        time.sleep(delays[ticker])
+        return {'profile': {'symbol': ticker}}
+    mocker.patch.object(analyzer, 'analyze', side_effect=fake_analyze)
+
+    results = analyzer.batch_analyze(['AAA', 'BBB', 'CCC'], max_workers=3)
+
+    assert [r['profile']['symbol'] for r in results] == ['AAA', 'BBB', 'CCC']
+
+def test_analyze_stored_quarter_skips_network(analyzer, mocker):
+    """
+    Tests that a call already in the database is returned without fetching the
+    profile or transcript when quarter and year are given.
+    """
+    mocker.patch.object(analyzer, '_find_existing_call', return_value=('row',))
+    mocker.patch.object(analyzer, '_format_existing_call_data', return_value={'quarter': 'Q1'})
+    mock_profile = mocker.patch('earnings_analyzer.analyzer.fetch_company_profile')
+    mock_transcript = mocker.patch('earnings_analyzer.analyzer.fetch_transcript')
+
+    result = analyzer.analyze('TEST', quarter='q1', year=2023)
+
+    assert result == {'quarter': 'Q1'}
+    analyzer._find_existing_call.assert_called_once_with('TEST', 'Q1', 2023)
+    mock_profile.assert_not_called()
+    mock_transcript.assert_not_called()
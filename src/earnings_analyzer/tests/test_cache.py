@@ -0,0 +1,51 @@
+import unittest
+import tempfile
+import time
+import json
+
+from earnings_analyzer.utils.cache import FileCache
+
+class TestFileCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = FileCache(cache_dir=self.tmp_dir.name, enabled=True)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_set_and_get(self):
+        self.assertTrue(self.cache.set("fmp_profile", "AAPL", {"symbol": "AAPL"}))
+        self.assertEqual(self.cache.get("fmp_profile", "AAPL"), {"symbol": "AAPL"})
+        self.assertIsNone(self.cache.get("fmp_profile", "MSFT"))
+
+    def test_expired_entry_is_ignored(self):
+        self.cache.set("fmp_historical_prices", "AAPL", [{"date": "2024-07-29", "close": 213.0}])
+        path = self.cache._entry_path("fmp_historical_prices", "AAPL")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"ts": time.time() - 2 * 86400, "data": []}, f)
+
+        self.assertIsNone(self.cache.get("fmp_historical_prices", "AAPL", ttl_days=1))
+        self.assertEqual(self.cache.get("fmp_historical_prices", "AAPL"), [])
+
+    def test_cached_decorator_skips_none_results(self):
+        calls = []
+
+        @self.cache.cached(endpoint="test_endpoint", ttl_days=1)
+        def fetch(ticker):
+            calls.append(ticker)
+            return {"symbol": ticker} if ticker == "AAPL" else None
+
+        self.assertEqual(fetch("AAPL"), {"symbol": "AAPL"})
+        self.assertEqual(fetch("AAPL"), {"symbol": "AAPL"})
+        self.assertIsNone(fetch("NONE"))
+        self.assertIsNone(fetch("NONE"))
+        self.assertEqual(calls, ["AAPL", "NONE", "NONE"])
+
+    def test_disabled_cache_is_a_no_op(self):
+        cache = FileCache(cache_dir=self.tmp_dir.name, enabled=False)
+        self.assertFalse(cache.set("fmp_profile", "AAPL", {"symbol": "AAPL"}))
+        self.assertIsNone(cache.get("fmp_profile", "AAPL"))
+
+if __name__ == '__main__':
+    unittest.main()
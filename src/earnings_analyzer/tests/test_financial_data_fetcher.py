@@ -1,12 +1,13 @@
 import unittest
 from unittest.mock import patch
 import json
+import datetime
 
-from earnings_analyzer.data.financial_data_fetcher import get_company_profile, get_historical_prices
+from earnings_analyzer.data.financial_data_fetcher import get_company_profile, get_historical_prices, calculate_stock_performance
 
 class TestFinancialDataFetcher(unittest.TestCase):
 
-    @patch('requests.get')
+    @patch('earnings_analyzer.data.financial_data_fetcher._session.get')
     def test_get_company_profile_success(self, mock_get):
         mock_response = unittest.mock.Mock()
         mock_response.status_code = 200
@@ -23,7 +24,7 @@ class TestFinancialDataFetcher(unittest.TestCase):
         self.assertEqual(profile['symbol'], "AAPL")
         self.assertEqual(profile['companyName'], "Apple Inc.")
 
-    @patch('requests.get')
+    @patch('earnings_analyzer.data.financial_data_fetcher._session.get')
     def test_get_company_profile_not_found(self, mock_get):
         mock_response = unittest.mock.Mock()
         mock_response.status_code = 200
@@ -33,7 +34,7 @@ class TestFinancialDataFetcher(unittest.TestCase):
         profile = get_company_profile("NONEXISTENT")
         self.assertIsNone(profile)
 
-    @patch('requests.get')
+    @patch('earnings_analyzer.data.financial_data_fetcher._session.get')
     def test_get_historical_prices_success(self, mock_get):
         mock_response = unittest.mock.Mock()
         mock_response.status_code = 200
@@ -50,7 +51,7 @@ class TestFinancialDataFetcher(unittest.TestCase):
         self.assertEqual(len(prices), 2)
         self.assertEqual(prices[0]['close'], 213.00)
 
-    @patch('requests.get')
+    @patch('earnings_analyzer.data.financial_data_fetcher._session.get')
     def test_get_historical_prices_not_found(self, mock_get):
         mock_response = unittest.mock.Mock()
         mock_response.status_code = 200
@@ -60,5 +61,44 @@ class TestFinancialDataFetcher(unittest.TestCase):
         prices = get_historical_prices("NONEXISTENT")
         self.assertIsNone(prices)
 
+    @patch('earnings_analyzer.data.financial_data_fetcher._check_fmp_api_key', return_value=True)
+    @patch('earnings_analyzer.data.financial_data_fetcher._session.get')
+    def test_get_historical_prices_date_range(self, mock_get, mock_check_key):
+        mock_response = unittest.mock.Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "historical": [{"date": "2024-02-01", "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0}]
+        }
+        mock_get.return_value = mock_response
+
+        prices = get_historical_prices("AAPL", from_date="2024-01-25", to_date=datetime.date(2024, 5, 3))
+        self.assertEqual(len(prices), 1)
+        url = mock_get.call_args[0][0]
+        self.assertIn("&from=2024-01-25", url)
+        self.assertIn("&to=2024-05-03", url)
+
+    def test_calculate_stock_performance_uses_nearest_trading_days(self):
+        # Unsorted, newest-first like the FMP response; call date falls on a non-trading day
+        historical_prices = [
+            {"date": "2024-05-01", "close": 130.0},
+            {"date": "2024-03-01", "close": 120.0},
+            {"date": "2024-02-09", "close": 110.0},
+            {"date": "2024-01-26", "close": 105.0},
+            {"date": "2024-01-19", "close": 100.0},
+            {"date": "2024-01-01", "close": 90.0},
+        ]
+
+        performance = calculate_stock_performance("AAPL", "2024-01-20", historical_prices)
+        self.assertIsNotNone(performance)
+        self.assertEqual(performance['price_at_call'], 100.0)   # Closest prior close (01-19)
+        self.assertEqual(performance['price_1_week'], 110.0)    # First close on/after 01-27
+        self.assertEqual(performance['price_1_month'], 120.0)   # First close on/after 02-19
+        self.assertEqual(performance['price_3_month'], 130.0)   # First close on/after 04-19
+        self.assertAlmostEqual(performance['performance_1_month'], 0.2)
+
+    def test_calculate_stock_performance_no_prior_price(self):
+        historical_prices = [{"date": "2024-05-01", "close": 130.0}]
+        self.assertIsNone(calculate_stock_performance("AAPL", "2024-01-20", historical_prices))
+
 if __name__ == '__main__':
     unittest.main()
@@ -2,7 +2,10 @@ import unittest
 from unittest.mock import patch, MagicMock
 import requests
 
-from earnings_analyzer.analysis.fool_scraper import find_latest_transcript_url, get_transcript_from_fool
+from earnings_analyzer.analysis.fool_scraper import (
+    find_latest_transcript_url, find_transcript_url_by_quarter, get_transcript_from_fool,
+    get_transcript_metadata_from_url
+)
 
 class TestFoolScraper(unittest.TestCase):
 
@@ -19,7 +22,27 @@ class TestFoolScraper(unittest.TestCase):
         url = find_latest_transcript_url("NONEXISTENT")
         self.assertIsNone(url)
 
-    @patch('requests.get')
+    @patch('earnings_analyzer.analysis.fool_scraper.time.sleep')
+    @patch('earnings_analyzer.analysis.fool_scraper.search')
+    def test_find_transcript_url_by_quarter_matches_slug(self, mock_search, mock_sleep):
+        mock_search.return_value = iter([
+            'https://www.fool.com/earnings/call-transcripts/2024/01/30/apple-aapl-q4-2024-earnings-call-transcript/',
+            'https://www.fool.com/earnings/call-transcripts/2024/05/02/apple-aapl-q2-2024-earnings-call-transcript/',
+        ])
+        url = find_transcript_url_by_quarter("AAPL", "Q2", 2024)
+        self.assertIn("aapl-q2-2024", url)
+
+    def test_get_transcript_metadata_from_url_flexible_pattern(self):
+        # No "-transcript" suffix, so only the catch-all pattern applies
+        metadata = get_transcript_metadata_from_url(
+            'https://www.fool.com/earnings/call-transcripts/2024/01/30/apple-aapl-q1-2025-earnings-call/'
+        )
+        self.assertEqual(metadata['ticker'], 'AAPL')
+        self.assertEqual(metadata['quarter'], 'Q1')
+        self.assertEqual(metadata['year'], 2025)
+        self.assertEqual(metadata['url_date'], '2024-01-30')
+
+    @patch('earnings_analyzer.analysis.fool_scraper._session.get')
     def test_get_transcript_from_fool_success(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -30,7 +53,7 @@ class TestFoolScraper(unittest.TestCase):
         self.assertIsNotNone(transcript)
         self.assertIn("This is the transcript.", transcript)
 
-    @patch('requests.get')
+    @patch('earnings_analyzer.analysis.fool_scraper._session.get')
     def test_get_transcript_from_fool_no_article_body(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -40,7 +63,7 @@ class TestFoolScraper(unittest.TestCase):
         transcript = get_transcript_from_fool("http://example.com/no-transcript")
         self.assertIsNone(transcript)
 
-    @patch('requests.get')
+    @patch('earnings_analyzer.analysis.fool_scraper._session.get')
     def test_get_transcript_from_fool_http_error(self, mock_get):
         mock_get.side_effect = requests.exceptions.RequestException("HTTP Error")
         transcript = get_transcript_from_fool("http://example.com/error")
@@ -0,0 +1,198 @@
+import json
+import tempfile
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+from google.api_core import exceptions as google_exceptions
+
+from earnings_analyzer.analysis.sentiment_analyzer import (
+    _condense_transcript, _call_with_retry, _build_response_schema, _parse_json_response,
+    _supports_json_output, _make_gemini_request, score_sentiment, CHARS_PER_TOKEN
+)
+from earnings_analyzer.analysis.fool_scraper import get_transcript_from_fool
+from earnings_analyzer.utils.cache import FileCache, response_cache
+
+# Condensed excerpt of a fool.com transcript page: "Operator" and "Name -- Title"
+# headers are their own paragraphs, with the name in <strong> and title in <em>
+FOOL_TRANSCRIPT_HTML = """<html><body><div class="article-body">
+<h2>Prepared Remarks:</h2>
+<p><strong>Operator</strong></p>
+<p>Good day, and welcome to the Apple Q1 fiscal year 2025 earnings conference call.</p>
+<p>At this time, I would like to turn the call over to Suhasini Chandramouli.</p>
+<p><strong>Suhasini Chandramouli</strong> -- <em>Director, Investor Relations</em></p>
+<p>Thank you. Good afternoon, and thank you for joining us.</p>
+<p><strong>Tim Cook</strong> -- <em>Chief Executive Officer</em></p>
+<p>Revenue grew 4% year over year to a new all-time record.</p>
+<p>Services set an all-time revenue record, and our installed base of active devices reached a new high.</p>
+<h2>Questions &amp; Answers:</h2>
+<p><strong>Operator</strong></p>
+<p>Our first question comes from Erik Woodring with Morgan Stanley. Please go ahead.</p>
+<p><strong>Erik Woodring</strong> -- <em>Morgan Stanley -- Analyst</em></p>
+<p>How should we think about gross margin for the March quarter?</p>
+<p><strong>Kevan Parekh</strong> -- <em>Chief Financial Officer</em></p>
+<p>We expect gross margin to be between 46% and 47%.</p>
+<p><strong>Operator</strong></p>
+<p>This concludes today's call. You may now disconnect.</p>
+</div></body></html>"""
+
+def _scrape(html):
+    """Run HTML through get_transcript_from_fool() with the network and cache mocked out."""
+    response = MagicMock(status_code=200, headers={'content-type': 'text/html; charset=utf-8'},
+                         content=html.encode('utf-8'), apparent_encoding='utf-8')
+    url = 'https://www.fool.com/earnings/call-transcripts/2025/01/30/apple-aapl-q1-2025-earnings-call-transcript/'
+    with patch('earnings_analyzer.analysis.fool_scraper._session.get', return_value=response), \
+            patch.object(response_cache, 'enabled', False):
+        return get_transcript_from_fool(url)
+
+class TestCondenseTranscript(unittest.TestCase):
+
+    def test_drops_operator_turns_from_scraped_transcript(self):
+        self.assertEqual(_condense_transcript(_scrape(FOOL_TRANSCRIPT_HTML)), "\n".join([
+            "Prepared Remarks:",
+            "Suhasini Chandramouli -- Director, Investor Relations",
+            "Thank you. Good afternoon, and thank you for joining us.",
+            "Tim Cook -- Chief Executive Officer",
+            "Revenue grew 4% year over year to a new all-time record.",
+            "Services set an all-time revenue record, and our installed base of active devices reached a new high.",
+            "Questions & Answers:",
+            "Erik Woodring -- Morgan Stanley -- Analyst",
+            "How should we think about gross margin for the March quarter?",
+            "Kevan Parekh -- Chief Financial Officer",
+            "We expect gross margin to be between 46% and 47%.",
+        ]))
+
+    def test_drops_boilerplate_and_duplicate_lines(self):
+        transcript = "\n".join([
+            "Revenue   grew 12% year over year.",
+            "This call contains forward-looking statements that involve risks.",
+            "Revenue grew 12% year over year.",
+            "The Motley Fool has a disclosure policy."
+        ])
+        self.assertEqual(_condense_transcript(transcript), "Revenue grew 12% year over year.")
+
+    def test_keeps_prepared_remarks_and_whole_qa_turns(self):
+        prepared = "\n".join(f"Prepared remark number {i} about quarterly results." for i in range(10))
+        turns = []
+        for i in range(20):
+            turns.append(f"Analyst {i} -- Big Bank")
+            turns.append(f"Question {i} about the margin outlook for next year?")
+            turns.append("Jane Doe -- Chief Executive Officer")
+            turns.append((f"Answer {i}: " + "we remain confident " * 10).strip())
+        transcript = prepared + "\nQuestions & Answers:\n" + "\n".join(turns)
+
+        max_tokens = 400
+        condensed = _condense_transcript(transcript, max_tokens=max_tokens)
+
+        self.assertLessEqual(len(condensed), max_tokens * CHARS_PER_TOKEN)
+        self.assertTrue(condensed.startswith(prepared))
+        self.assertIn("Question 0 about", condensed)
+        self.assertNotIn("Question 19 about", condensed)
+        # Truncation happens at a turn boundary, so the last kept line is complete
+        self.assertIn(condensed.split("\n")[-1], turns)
+
+class TestCallWithRetry(unittest.TestCase):
+
+    @patch('earnings_analyzer.analysis.sentiment_analyzer.time.sleep')
+    def test_retries_transient_errors_then_succeeds(self, mock_sleep):
+        fn = MagicMock(side_effect=[google_exceptions.ResourceExhausted("429"),
+                                    google_exceptions.ServiceUnavailable("503"),
+                                    "ok"])
+        self.assertEqual(_call_with_retry(fn, base_delay=1.0), "ok")
+        self.assertEqual(fn.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        # Second delay is 2s scaled by jitter in [0.5, 1.5]
+        self.assertTrue(1.0 <= mock_sleep.call_args_list[1][0][0] <= 3.0)
+
+    @patch('earnings_analyzer.analysis.sentiment_analyzer.time.sleep')
+    def test_reraises_after_max_attempts_and_on_other_errors(self, mock_sleep):
+        fn = MagicMock(side_effect=google_exceptions.DeadlineExceeded("timeout"))
+        with self.assertRaises(google_exceptions.DeadlineExceeded):
+            _call_with_retry(fn, max_attempts=3)
+        self.assertEqual(fn.call_count, 3)
+
+        fn = MagicMock(side_effect=ValueError("bad request"))
+        with self.assertRaises(ValueError):
+            _call_with_retry(fn)
+        self.assertEqual(fn.call_count, 1)
+
+class TestStructuredOutput(unittest.TestCase):
+
+    def test_build_response_schema_follows_included_fields(self):
+        schema = _build_response_schema()
+        self.assertEqual(schema['required'], ['overall_sentiment_score', 'confidence_level',
+                                              'key_themes', 'qualitative_assessment'])
+        self.assertEqual(schema['properties']['key_themes'], {'type': 'array', 'items': {'type': 'string'}})
+
+        schema = _build_response_schema(include_key_themes=False, include_qualitative_assessment=False)
+        self.assertEqual(schema['required'], ['overall_sentiment_score', 'confidence_level'])
+
+    def test_parse_json_response_falls_back_to_sanitizing(self):
+        self.assertEqual(_parse_json_response('{"overall_sentiment_score": 7}'), {"overall_sentiment_score": 7})
+        fenced = 'Here you go:\n```json\n{"overall_sentiment_score": 6}\n```'
+        self.assertEqual(_parse_json_response(fenced), {"overall_sentiment_score": 6})
+        self.assertIsNone(_parse_json_response("no json here"))
+
+    def test_supports_json_output(self):
+        self.assertTrue(_supports_json_output('gemini-2.5-flash'))
+        self.assertTrue(_supports_json_output('gemini-1.5-pro-002'))
+        self.assertFalse(_supports_json_output('gemini-pro'))
+        self.assertFalse(_supports_json_output('gemini-1.0-pro-001'))
+
+    @patch('earnings_analyzer.analysis.sentiment_analyzer._handle_rate_limiting')
+    @patch('earnings_analyzer.analysis.sentiment_analyzer.genai.types.GenerationConfig', side_effect=lambda **kwargs: kwargs)
+    def test_falls_back_to_plain_text_when_json_mode_rejected(self, mock_config, mock_rate_limit):
+        model = MagicMock()
+        model.generate_content.side_effect = [
+            google_exceptions.InvalidArgument("JSON mode is not enabled for models/gemini-1.0-pro"),
+            MagicMock(text='{"overall_sentiment_score": 7}'),
+        ]
+
+        response = _make_gemini_request(model, "prompt", json_output=True,
+                                        response_schema=_build_response_schema())
+
+        self.assertEqual(response.text, '{"overall_sentiment_score": 7}')
+        first_config = model.generate_content.call_args_list[0][1]['generation_config']
+        second_config = model.generate_content.call_args_list[1][1]['generation_config']
+        self.assertEqual(first_config['response_mime_type'], 'application/json')
+        self.assertNotIn('response_mime_type', second_config)
+        self.assertNotIn('response_schema', second_config)
+
+class TestScoreSentimentCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = FileCache(cache_dir=self.tmp_dir.name, enabled=True)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    @patch('earnings_analyzer.analysis.sentiment_analyzer._make_gemini_request')
+    @patch('earnings_analyzer.analysis.sentiment_analyzer._get_model')
+    @patch('earnings_analyzer.analysis.sentiment_analyzer.get_gemini_api_key', return_value="key")
+    def test_cache_hit_does_not_rewrite_entry(self, mock_key, mock_model, mock_request):
+        mock_request.return_value = MagicMock(text=json.dumps({
+            "overall_sentiment_score": 7, "confidence_level": 0.8,
+            "key_themes": ["growth"], "qualitative_assessment": "Upbeat."
+        }))
+        transcript = "Revenue grew 12% year over year and margins expanded. " * 5
+
+        with patch('earnings_analyzer.analysis.sentiment_analyzer.response_cache', self.cache):
+            self.assertIsNotNone(score_sentiment(transcript))
+            entry_path = next(self.cache.cache_dir.glob("gemini_sentiment/*.json"))
+            written_ts = time.time() - 3600
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            entry['ts'] = written_ts
+            with open(entry_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+
+            result = score_sentiment(transcript)
+
+        self.assertEqual(result['overall_sentiment_score'], 7)
+        mock_request.assert_called_once()
+        with open(entry_path, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['ts'], written_ts)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Determine the cache directory
+# Prioritize EARNINGS_ANALYZER_CACHE_DIR environment variable
+# Otherwise, default to ~/.earnings_analyzer/cache next to the database
+if os.getenv("EARNINGS_ANALYZER_CACHE_DIR"):
+    CACHE_DIR = os.getenv("EARNINGS_ANALYZER_CACHE_DIR")
+else:
+    CACHE_DIR = str(Path.home() / ".earnings_analyzer" / "cache")
+
+
+class FileCache:
+    """
+    Simple on-disk cache for API responses.
+
+    Entries are stored as JSON files under ``<cache_dir>/<endpoint>/<md5(key)>.json``
+    with the shape ``{"ts": <unix timestamp>, "data": <payload>}``. Expiry is
+    checked on read, so each caller can choose its own TTL for an endpoint.
+    """
+
+    def __init__(self, cache_dir=None, enabled=None):
+        """
+        Args:
+            cache_dir (str, optional): Root directory for cache files. Defaults to CACHE_DIR.
+            enabled (bool, optional): Whether reads and writes are performed. Defaults to True
+                unless EARNINGS_ANALYZER_DISABLE_CACHE is set to a truthy value.
+        """
+        self.cache_dir = Path(cache_dir or CACHE_DIR)
+        if enabled is None:
+            enabled = os.getenv("EARNINGS_ANALYZER_DISABLE_CACHE", "").lower() not in ("1", "true", "yes")
+        self.enabled = enabled
+
+    def _entry_path(self, endpoint, key):
+        """Return the file path for a cache entry."""
+        digest = hashlib.md5(key.encode('utf-8')).hexdigest()
+        return self.cache_dir / endpoint / f"{digest}.json"
+
+    def get(self, endpoint, key, ttl_days=None):
+        """
+        Look up a cached payload.
+
+        Args:
+            endpoint (str): Cache namespace, e.g. "fmp_profile"
+            key (str): Cache key; hashed to build the file name
+            ttl_days (float, optional): Maximum entry age in days. None means entries never expire.
+
+        Returns:
+            The cached payload, or None on a miss, an expired entry, or a read error.
+        """
+        if not self.enabled:
+            return None
+
+        path = self._entry_path(endpoint, key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+        if ttl_days is not None and time.time() - entry.get('ts', 0) > ttl_days * 86400:
+            return None
+
+        return entry.get('data')
+
+    def set(self, endpoint, key, data):
+        """
+        Store a JSON-serializable payload.
+
+        Returns:
+            bool: True if the entry was written, False otherwise
+        """
+        if not self.enabled:
+            return False
+
+        path = self._entry_path(endpoint, key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({'ts': time.time(), 'data': data}, f)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write cache entry for {endpoint}: {e}")
+            return False
+
+    def clear(self, endpoint=None):
+        """Remove all cached entries, or only those for a single endpoint."""
+        target = self.cache_dir / endpoint if endpoint else self.cache_dir
+        try:
+            shutil.rmtree(target)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not clear cache at {target}: {e}")
+
+    def cached(self, endpoint, ttl_days=None):
+        """
+        Decorator that caches a function's return value keyed on its arguments.
+
+        None results are never cached, so failed lookups are retried on the next call.
+
+        Args:
+            endpoint (str): Cache namespace for the decorated function
+            ttl_days (float, optional): Maximum entry age in days. None means entries never expire.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key = json.dumps([func.__name__, args, kwargs], sort_keys=True, default=str)
+
+                data = self.get(endpoint, key, ttl_days=ttl_days)
+                if data is not None:
+                    logger.debug(f"Cache hit for {endpoint}")
+                    return data
+
+                result = func(*args, **kwargs)
+                if result is not None:
+                    self.set(endpoint, key, result)
+                return result
+            return wrapper
+        return decorator
+
+
+# Shared cache instance used by the API client modules
+response_cache = FileCache()
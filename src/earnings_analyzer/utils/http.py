@@ -0,0 +1,24 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def create_session(pool_connections=16, pool_maxsize=32):
+    """
+    Create a requests Session with a pooled adapter.
+
+    Reusing one session per API host keeps TCP/TLS connections alive between
+    calls, so batch analysis pays the handshake cost once instead of per request.
+    Retries are left to the callers, which already handle rate limits and backoff.
+
+    Args:
+        pool_connections (int): Number of host connection pools to cache
+        pool_maxsize (int): Maximum connections kept per host pool
+
+    Returns:
+        requests.Session: Session with the pooled adapter mounted for http and https
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session